@@ -0,0 +1,82 @@
+import atexit
+import hashlib
+import os
+import shutil
+import tempfile
+import threading
+
+from collections import OrderedDict
+from collections.abc import Callable
+
+
+class FileStore:
+    """Spills file part payloads to disk so the server keeps only handles.
+
+    Files are named after the SHA-256 of their content, so the same image
+    shown in several messages is stored once. Served files are streamed
+    from disk instead of being decoded from base64 on every request.
+
+    The store holds at most max_bytes. Beyond that the least recently used
+    files are deleted and on_evict is called with their path, so handles
+    to them can be dropped.
+    """
+
+    def __init__(
+        self,
+        directory: str | None = None,
+        max_bytes: int | None = 512 * 1024 * 1024,
+        on_evict: Callable[[str], None] | None = None,
+    ):
+        if directory is None:
+            directory = tempfile.mkdtemp(prefix='a2a-ui-files-')
+            atexit.register(shutil.rmtree, directory, ignore_errors=True)
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.on_evict = on_evict
+        # Size of every file, least recently used first.
+        self._sizes: OrderedDict[str, int] = OrderedDict()
+        self._total_bytes = 0
+        self._lock = threading.Lock()
+
+    def put(self, data: bytes) -> str:
+        """Stores raw bytes and returns the path of the file holding them."""
+        path = os.path.join(self.directory, hashlib.sha256(data).hexdigest())
+        if not os.path.exists(path):
+            # Write under a unique name and rename, so a request never
+            # serves a partially written file.
+            fd, tmp_path = tempfile.mkstemp(dir=self.directory)
+            with os.fdopen(fd, 'wb') as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        with self._lock:
+            if path not in self._sizes:
+                self._sizes[path] = len(data)
+                self._total_bytes += len(data)
+            self._sizes.move_to_end(path)
+            evicted = self._evict_locked()
+        for evicted_path in evicted:
+            if self.on_evict is not None:
+                self.on_evict(evicted_path)
+        return path
+
+    def touch(self, path: str) -> None:
+        """Marks a file as used, so it is evicted last."""
+        with self._lock:
+            if path in self._sizes:
+                self._sizes.move_to_end(path)
+
+    def _evict_locked(self) -> list[str]:
+        evicted = []
+        if self.max_bytes is None:
+            return evicted
+        # The file just stored is kept even if it alone exceeds the limit.
+        while self._total_bytes > self.max_bytes and len(self._sizes) > 1:
+            path, size = self._sizes.popitem(last=False)
+            self._total_bytes -= size
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            evicted.append(path)
+        return evicted
@@ -0,0 +1,231 @@
+import asyncio
+import base64
+import os
+import threading
+import uuid
+
+from typing import cast
+
+import httpx
+
+from a2a.types import FilePart, FileWithBytes, FileWithUri, Message, Part
+from fastapi import FastAPI, Request
+from fastapi.responses import FileResponse
+
+from service.types import (
+    CreateConversationResponse,
+    GetEventResponse,
+    ListAgentResponse,
+    ListConversationResponse,
+    ListMessageResponse,
+    ListTaskResponse,
+    MessageInfo,
+    PendingMessageResponse,
+    RegisterAgentResponse,
+    SendMessageResponse,
+)
+
+from .adk_host_manager import ADKHostManager, get_message_id
+from .application_manager import ApplicationManager
+from .file_store import FileStore
+from .in_memory_manager import InMemoryFakeAgentManager
+
+
+class ConversationServer:
+    """ConversationServer is the backend to serve the agent interactions in the UI
+
+    This defines the interface that is used by the Mesop system to interact with
+    agents and provide details about the executions.
+    """
+
+    def __init__(self, app: FastAPI, http_client: httpx.AsyncClient):
+        agent_manager = os.environ.get('A2A_HOST', 'ADK')
+        self.manager: ApplicationManager
+
+        # Get API key from environment
+        api_key = os.environ.get('GOOGLE_API_KEY', '')
+        uses_vertex_ai = (
+            os.environ.get('GOOGLE_GENAI_USE_VERTEXAI', '').upper() == 'TRUE'
+        )
+
+        if agent_manager.upper() == 'ADK':
+            self.manager = ADKHostManager(
+                http_client,
+                api_key=api_key,
+                uses_vertex_ai=uses_vertex_ai,
+            )
+        else:
+            self.manager = InMemoryFakeAgentManager()
+        self._file_store = FileStore(on_evict=self._forget_file)
+        # dict[str, tuple[str, str]] maps file id to (path, mime type)
+        self._file_cache = {}
+        # dict[str, set[str]] maps path to the file ids served from it
+        self._file_ids_by_path = {}
+        self._message_to_cache = {}  # dict[str, str] maps message id to cache id
+
+        app.add_api_route(
+            '/conversation/create', self._create_conversation, methods=['POST']
+        )
+        app.add_api_route(
+            '/conversation/list', self._list_conversation, methods=['POST']
+        )
+        app.add_api_route('/message/send', self._send_message, methods=['POST'])
+        app.add_api_route('/events/get', self._get_events, methods=['POST'])
+        app.add_api_route(
+            '/message/list', self._list_messages, methods=['POST']
+        )
+        app.add_api_route(
+            '/message/pending', self._pending_messages, methods=['POST']
+        )
+        app.add_api_route('/task/list', self._list_tasks, methods=['POST'])
+        app.add_api_route(
+            '/agent/register', self._register_agent, methods=['POST']
+        )
+        app.add_api_route('/agent/list', self._list_agents, methods=['POST'])
+        app.add_api_route(
+            '/message/file/{file_id}', self._files, methods=['GET']
+        )
+        app.add_api_route(
+            '/api_key/update', self._update_api_key, methods=['POST']
+        )
+
+    # Update API key in manager
+    def update_api_key(self, api_key: str):
+        if isinstance(self.manager, ADKHostManager):
+            self.manager.update_api_key(api_key)
+
+    async def _create_conversation(self):
+        c = await self.manager.create_conversation()
+        return CreateConversationResponse(result=c)
+
+    async def _send_message(self, request: Request):
+        message_data = await request.json()
+        message = Message(**message_data['params'])
+        message = self.manager.sanitize_message(message)
+        loop = asyncio.get_event_loop()
+        if isinstance(self.manager, ADKHostManager):
+            t = threading.Thread(
+                target=lambda: cast(
+                    ADKHostManager, self.manager
+                ).process_message_threadsafe(message, loop)
+            )
+        else:
+            t = threading.Thread(
+                target=lambda: asyncio.run(
+                    self.manager.process_message(message)
+                )
+            )
+        t.start()
+        return SendMessageResponse(
+            result=MessageInfo(
+                message_id=message.messageId,
+                context_id=message.contextId if message.contextId else '',
+            )
+        )
+
+    async def _list_messages(self, request: Request):
+        message_data = await request.json()
+        conversation_id = message_data['params']
+        conversation = self.manager.get_conversation(conversation_id)
+        if conversation:
+            return ListMessageResponse(
+                result=self.cache_content(conversation.messages)
+            )
+        return ListMessageResponse(result=[])
+
+    def cache_content(self, messages: list[Message]):
+        rval = []
+        for m in messages:
+            message_id = get_message_id(m)
+            if not message_id:
+                rval.append(m)
+                continue
+            new_parts: list[Part] = []
+            for i, p in enumerate(m.parts):
+                part = p.root
+                if part.kind != 'file' or not isinstance(
+                    part.file, FileWithBytes
+                ):
+                    new_parts.append(p)
+                    continue
+                message_part_id = f'{message_id}:{i}'
+                if message_part_id in self._message_to_cache:
+                    cache_id = self._message_to_cache[message_part_id]
+                else:
+                    cache_id = str(uuid.uuid4())
+                    self._message_to_cache[message_part_id] = cache_id
+                # Replace the part data with a url reference
+                new_parts.append(
+                    Part(
+                        root=FilePart(
+                            file=FileWithUri(
+                                mimeType=part.file.mimeType,
+                                uri=f'/message/file/{cache_id}',
+                            )
+                        )
+                    )
+                )
+                if cache_id not in self._file_cache:
+                    path = self._file_store.put(self._file_content(part))
+                    self._file_cache[cache_id] = (path, part.file.mimeType)
+                    self._file_ids_by_path.setdefault(path, set()).add(
+                        cache_id
+                    )
+            m.parts = new_parts
+            rval.append(m)
+        return rval
+
+    async def _pending_messages(self):
+        return PendingMessageResponse(
+            result=self.manager.get_pending_messages()
+        )
+
+    def _list_conversation(self):
+        return ListConversationResponse(result=self.manager.conversations)
+
+    def _get_events(self):
+        return GetEventResponse(result=self.manager.events)
+
+    def _list_tasks(self):
+        return ListTaskResponse(result=self.manager.tasks)
+
+    async def _register_agent(self, request: Request):
+        message_data = await request.json()
+        url = message_data['params']
+        self.manager.register_agent(url)
+        return RegisterAgentResponse()
+
+    async def _list_agents(self):
+        return ListAgentResponse(result=self.manager.agents)
+
+    @staticmethod
+    def _file_content(part: FilePart) -> bytes:
+        if 'image' in (part.file.mimeType or ''):
+            return base64.b64decode(part.file.bytes)
+        return part.file.bytes.encode()
+
+    def _files(self, file_id):
+        if file_id not in self._file_cache:
+            raise Exception('file not found')
+        path, mime_type = self._file_cache[file_id]
+        self._file_store.touch(path)
+        return FileResponse(path, media_type=mime_type)
+
+    def _forget_file(self, path: str):
+        """Drops the file ids of a file the store has evicted."""
+        for file_id in self._file_ids_by_path.pop(path, ()):
+            self._file_cache.pop(file_id, None)
+
+    async def _update_api_key(self, request: Request):
+        """Update the API key"""
+        try:
+            data = await request.json()
+            api_key = data.get('api_key', '')
+
+            if api_key:
+                # Update in the manager
+                self.update_api_key(api_key)
+                return {'status': 'success'}
+            return {'status': 'error', 'message': 'No API key provided'}
+        except Exception as e:
+            return {'status': 'error', 'message': str(e)}
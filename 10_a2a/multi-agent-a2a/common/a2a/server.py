@@ -2,14 +2,15 @@
 A2A server base class for implementing A2A agents.
 """
 import asyncio
+import hashlib
 import json
 import uuid
 from abc import ABC, abstractmethod
 from datetime import datetime
 from typing import Any, Callable, Dict, List, Optional, Set
 
-from fastapi import FastAPI, HTTPException, WebSocket, WebSocketDisconnect
-from fastapi.responses import JSONResponse
+from fastapi import FastAPI, HTTPException, Request, WebSocket, WebSocketDisconnect
+from fastapi.responses import JSONResponse, Response
 from pydantic import BaseModel
 
 from ..types import AgentCard, Artifact, Message, Task, TaskState, TaskStatus, TextPart
@@ -28,13 +29,16 @@ class A2ABaseServer(ABC):
         self,
         agent_card: AgentCard,
         app: Optional[FastAPI] = None,
+        agent_card_max_age: int = 300,
     ):
         """Initialize the A2A server.
         
         Args:
             agent_card: AgentCard describing this agent
             app: Optional FastAPI application to use
+            agent_card_max_age: Seconds clients may cache the AgentCard
         """
+        self.agent_card_max_age = agent_card_max_age
         self.agent_card = agent_card
         self.app = app or FastAPI(title=agent_card.name)
         self.tasks: Dict[str, Task] = {}
@@ -48,8 +52,8 @@ class A2ABaseServer(ABC):
         
         # AgentCard discovery
         @self.app.get("/.well-known/agent.json")
-        async def get_agent_card():
-            return self.agent_card.model_dump()
+        async def get_agent_card(request: Request):
+            return self._agent_card_response(request)
         
         # Task management
         @self.app.post("/tasks")
@@ -154,6 +158,47 @@ class A2ABaseServer(ABC):
                     if not self.task_subscribers[task_id]:
                         del self.task_subscribers[task_id]
     
+    @property
+    def agent_card(self) -> AgentCard:
+        """AgentCard describing this agent."""
+        return self._agent_card
+
+    @agent_card.setter
+    def agent_card(self, agent_card: AgentCard):
+        """Replace the AgentCard, invalidating the serialized copy.
+        
+        Args:
+            agent_card: New AgentCard to publish
+        """
+        self._agent_card = agent_card
+        self._agent_card_body: Optional[bytes] = None
+        self._agent_card_etag: Optional[str] = None
+
+    def _agent_card_response(self, request: Request) -> Response:
+        """Serve the AgentCard, serialized once per card, with an ETag.
+        
+        Args:
+            request: Incoming discovery request
+            
+        Returns:
+            The card with caching headers, or 304 if the client's copy is current
+        """
+        if self._agent_card_body is None:
+            self._agent_card_body = self.agent_card.model_dump_json().encode()
+            digest = hashlib.sha256(self._agent_card_body).hexdigest()
+            self._agent_card_etag = f'"{digest}"'
+        
+        headers = {
+            "ETag": self._agent_card_etag,
+            "Cache-Control": f"public, max-age={self.agent_card_max_age}",
+        }
+        if_none_match = request.headers.get("If-None-Match", "")
+        if self._agent_card_etag in if_none_match or if_none_match == "*":
+            return Response(status_code=304, headers=headers)
+        return Response(
+            self._agent_card_body, media_type="application/json", headers=headers
+        )
+    
     async def _notify_subscribers(self, task_id: str, task: Task):
         """Notify all subscribers about a task update.
         
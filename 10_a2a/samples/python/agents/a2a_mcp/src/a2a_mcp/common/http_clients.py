@@ -0,0 +1,85 @@
+# type: ignore
+import asyncio
+import logging
+import weakref
+
+from urllib.parse import urlsplit
+
+import httpx
+
+
+logger = logging.getLogger(__name__)
+
+
+class AgentHttpClients:
+    """httpx clients shared across agent calls, one per agent base URL.
+
+    Each client keeps its connections alive between calls, so calling the
+    same agent again skips the TCP (and TLS) setup. A per-agent client also
+    keeps a slow agent from using up the connections of the others.
+    """
+
+    def __init__(
+        self,
+        max_connections: int = 64,
+        max_keepalive_connections: int = 16,
+        keepalive_expiry: float = 60.0,
+        connect_timeout: float = 5.0,
+    ):
+        """Initializes the pool.
+
+        Args:
+            max_connections: Maximum open connections per agent.
+            max_keepalive_connections: Idle connections kept per agent.
+            keepalive_expiry: Seconds an idle connection is kept.
+            connect_timeout: Seconds to wait for a connection to an agent.
+        """
+        self.limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+            keepalive_expiry=keepalive_expiry,
+        )
+        self.timeout = httpx.Timeout(5.0, connect=connect_timeout)
+        self._clients: dict[str, httpx.AsyncClient] = {}
+
+    def get(self, url: str) -> httpx.AsyncClient:
+        """Returns the client for the agent serving url."""
+        parts = urlsplit(url)
+        base_url = f'{parts.scheme}://{parts.netloc}'
+        client = self._clients.get(base_url)
+        if client is None or client.is_closed:
+            logger.info(f'Opening connection pool for {base_url}')
+            client = self._clients[base_url] = httpx.AsyncClient(
+                limits=self.limits, timeout=self.timeout
+            )
+        return client
+
+    async def aclose(self) -> None:
+        clients, self._clients = self._clients, {}
+        for client in clients.values():
+            await client.aclose()
+
+
+# Event loop -> pool. The clients are bound to the loop they were used in.
+_http_clients: weakref.WeakKeyDictionary[
+    asyncio.AbstractEventLoop, AgentHttpClients
+] = weakref.WeakKeyDictionary()
+
+
+def get_http_clients() -> AgentHttpClients:
+    """Returns the pool shared by the running event loop."""
+    for loop in list(_http_clients):
+        if loop.is_closed():
+            del _http_clients[loop]
+    loop = asyncio.get_running_loop()
+    http_clients = _http_clients.get(loop)
+    if http_clients is None:
+        http_clients = _http_clients[loop] = AgentHttpClients()
+    return http_clients
+
+
+async def close_http_clients() -> None:
+    """Closes the pool of the running event loop, on shutdown."""
+    http_clients = _http_clients.pop(asyncio.get_running_loop(), None)
+    if http_clients is not None:
+        await http_clients.aclose()
@@ -0,0 +1,423 @@
+import asyncio
+import json
+import logging
+import uuid
+
+from collections import deque
+from collections.abc import AsyncIterable
+from enum import Enum
+from uuid import uuid4
+
+import httpx
+
+from a2a.client import A2AClient, A2AClientHTTPError
+from a2a.types import (
+    AgentCard,
+    MessageSendParams,
+    SendStreamingMessageRequest,
+    SendStreamingMessageSuccessResponse,
+    TaskArtifactUpdateEvent,
+    TaskState,
+    TaskStatusUpdateEvent,
+)
+from a2a_mcp.common.http_clients import AgentHttpClients, get_http_clients
+from a2a_mcp.common.utils import get_mcp_server_config
+from a2a_mcp.mcp import client
+
+
+logger = logging.getLogger(__name__)
+
+# Queued by a node task after its last chunk.
+_NODE_DONE = object()
+# Largest cosine similarity gap between the best agent for a task and a
+# fallback agent.
+FALLBACK_SCORE_GAP = 0.05
+
+
+class Status(Enum):
+    """Represents the status of a workflow and its associated node."""
+
+    READY = 'READY'
+    RUNNING = 'RUNNING'
+    COMPLETED = 'COMPLETED'
+    PAUSED = 'PAUSED'
+    INITIALIZED = 'INITIALIZED'
+
+
+class WorkflowNode:
+    """Represents a single node in a workflow graph.
+
+    Each node encapsulates a specific task to be executed, such as finding an
+    agent or invoking an agent's capabilities. It manages its own state
+    (e.g., READY, RUNNING, COMPLETED, PAUSED) and can execute its assigned task.
+
+    """
+
+    def __init__(
+        self,
+        task: str,
+        node_key: str | None = None,
+        node_label: str | None = None,
+    ):
+        self.id = str(uuid.uuid4())
+        self.node_key = node_key
+        self.node_label = node_label
+        self.task = task
+        self.results = None
+        self.state = Status.READY
+        # Agents resolved for the task, best first.
+        self.agent_cards: list[AgentCard] | None = None
+        self._prefetch_task: asyncio.Task | None = None
+
+    async def get_planner_resource(self) -> AgentCard | None:
+        logger.info(f'Getting resource for node {self.id}')
+        response = await self._mcp_sessions().call(
+            client.find_resource, 'resource://agent_cards/planner_agent'
+        )
+        data = json.loads(response.contents[0].text)
+        return AgentCard(**data['agent_card'][0])
+
+    async def find_agent_for_task(self) -> AgentCard | None:
+        logger.info(f'Find agent for task - {self.task}')
+        result = await self._mcp_sessions().call(client.find_agent, self.task)
+        agent_card_json = json.loads(result.content[0].text)
+        logger.debug(f'Found agent {agent_card_json} for task {self.task}')
+        return AgentCard(**agent_card_json)
+
+    async def find_agents_for_task(
+        self, k: int = 3, max_score_gap: float = FALLBACK_SCORE_GAP
+    ) -> list[AgentCard]:
+        """Finds up to k candidate agents for the task, best first.
+
+        Fallback candidates are only kept if they score within
+        max_score_gap of the best match, so a task is never handed to an
+        agent for something else just because its own agent is down.
+        """
+        logger.info(f'Find agents for task - {self.task}')
+        result = await self._mcp_sessions().call(
+            client.find_agents, self.task, k=k
+        )
+        matches = [json.loads(content.text) for content in result.content]
+        # A list may come back as one JSON array or one item per content.
+        if len(matches) == 1 and isinstance(matches[0], list):
+            matches = matches[0]
+        if matches:
+            min_score = matches[0]['score'] - max_score_gap
+            matches = [m for m in matches if m['score'] >= min_score]
+        logger.debug(f'Found agents {matches} for task {self.task}')
+        return [AgentCard(**match['agent_card']) for match in matches]
+
+    def prefetch_agent_cards(self) -> None:
+        """Starts looking up the agents for the node in the background.
+
+        The result is kept on the node, so running it does not wait for
+        discovery. A failed lookup is repeated when the node runs.
+        """
+        if self.agent_cards is None and self._prefetch_task is None:
+            self._prefetch_task = asyncio.create_task(self._prefetch())
+
+    async def _prefetch(self) -> None:
+        try:
+            self.agent_cards = await self._find_agent_cards()
+        except Exception as e:
+            logger.warning(f'Prefetching agents for node {self.id} failed: {e}')
+
+    async def _find_agent_cards(self) -> list[AgentCard]:
+        if self.node_key == 'planner':
+            return [await self.get_planner_resource()]
+        return await self.find_agents_for_task()
+
+    @staticmethod
+    def _mcp_sessions() -> client.MCPSessionPool:
+        # Shared by all nodes, routing reuses open sessions.
+        config = get_mcp_server_config()
+        return client.get_session_pool(
+            config.host, config.port, config.transport
+        )
+
+    async def run_node(
+        self,
+        query: str,
+        task_id: str,
+        context_id: str,
+        http_clients: AgentHttpClients | None = None,
+    ) -> AsyncIterable[dict[str, any]]:
+        logger.info(f'Executing node {self.id}')
+        http_clients = http_clients or get_http_clients()
+        if not self.agent_cards and self._prefetch_task is not None:
+            await self._prefetch_task
+        if not self.agent_cards:
+            self.agent_cards = await self._find_agent_cards()
+        agent_cards = self.agent_cards
+        if not agent_cards:
+            raise ValueError(f'No agent found for task {self.task}')
+
+        # Fall back to the next candidate if an agent cannot be reached,
+        # as long as it has not streamed anything yet.
+        for attempt, agent_card in enumerate(agent_cards):
+            streamed = False
+            try:
+                async for chunk in self._send_to_agent(
+                    http_clients.get(agent_card.url),
+                    agent_card,
+                    query,
+                    task_id,
+                    context_id,
+                ):
+                    streamed = True
+                    yield chunk
+                return
+            except (httpx.HTTPError, A2AClientHTTPError) as e:
+                if streamed or attempt == len(agent_cards) - 1:
+                    raise
+                logger.warning(
+                    f'Agent {agent_card.name} failed, trying the next '
+                    f'candidate: {e}'
+                )
+
+    async def _send_to_agent(
+        self,
+        httpx_client: httpx.AsyncClient,
+        agent_card: AgentCard,
+        query: str,
+        task_id: str,
+        context_id: str,
+    ) -> AsyncIterable[dict[str, any]]:
+        client = A2AClient(httpx_client, agent_card)
+
+        payload: dict[str, any] = {
+            'message': {
+                'role': 'user',
+                'parts': [{'kind': 'text', 'text': query}],
+                'messageId': uuid4().hex,
+                'taskId': task_id,
+                'contextId': context_id,
+            },
+        }
+        request = SendStreamingMessageRequest(
+            id=str(uuid4()), params=MessageSendParams(**payload)
+        )
+        response_stream = client.send_message_streaming(request)
+        async for chunk in response_stream:
+            # Save the artifact as a result of the node
+            if isinstance(chunk.root, SendStreamingMessageSuccessResponse) and (
+                isinstance(chunk.root.result, TaskArtifactUpdateEvent)
+            ):
+                artifact = chunk.root.result.artifact
+                self.results = artifact
+            yield chunk
+
+
+class WorkflowGraph:
+    """Represents a graph of workflow nodes.
+
+    Nodes run as soon as all their predecessors have completed, up to
+    max_concurrency at a time, and the chunks of nodes running in parallel
+    are merged into one stream.
+
+    The graph keeps, per node, the number of predecessors that have not
+    completed, and the set of nodes whose count is zero. Both are updated
+    as nodes and edges are added and as nodes complete, so a run does not
+    sort the graph and only looks at unfinished nodes.
+    """
+
+    def __init__(
+        self,
+        max_concurrency: int = 8,
+        http_clients: AgentHttpClients | None = None,
+    ):
+        self.nodes = {}
+        self.latest_node = None
+        self.node_type = None
+        self.state = Status.INITIALIZED
+        self.paused_node_id = None
+        # Nodes that asked for input after the workflow had paused, with
+        # their question. They are asked one at a time, in order.
+        self._held_questions: deque[tuple[str, any]] = deque()
+        self.max_concurrency = max_concurrency
+        # Connections to the agents, shared by all nodes. Defaults to the
+        # pool of the event loop running the workflow.
+        self.http_clients = http_clients
+        self._attributes: dict[str, dict] = {}
+        self._successors: dict[str, list[str]] = {}
+        self._blocked_by: dict[str, int] = {}
+        # Ordered sets: nodes not completed yet, and those of them that
+        # can start.
+        self._unfinished: dict[str, None] = {}
+        self._ready: dict[str, None] = {}
+
+    @property
+    def graph(self):
+        """The workflow as a networkx DiGraph, built on demand."""
+        import networkx as nx
+
+        graph = nx.DiGraph()
+        for node_id, attributes in self._attributes.items():
+            graph.add_node(node_id, **attributes)
+        graph.add_edges_from(
+            (from_node_id, to_node_id)
+            for from_node_id, to_node_ids in self._successors.items()
+            for to_node_id in to_node_ids
+        )
+        return graph
+
+    def add_node(self, node) -> None:
+        logger.info(f'Adding node {node.id}')
+        self._attributes[node.id] = {'query': node.task}
+        self._successors[node.id] = []
+        self._blocked_by[node.id] = 0
+        self.nodes[node.id] = node
+        self.latest_node = node.id
+        if node.state != Status.COMPLETED:
+            self._unfinished[node.id] = None
+            self._ready[node.id] = None
+
+    def add_edge(self, from_node_id: str, to_node_id: str) -> None:
+        if from_node_id not in self.nodes or to_node_id not in self.nodes:
+            raise ValueError('Invalid node IDs')
+
+        self._successors[from_node_id].append(to_node_id)
+        if self.nodes[from_node_id].state != Status.COMPLETED:
+            self._blocked_by[to_node_id] += 1
+            self._ready.pop(to_node_id, None)
+
+    async def run_workflow(
+        self, start_node_id: str = None
+    ) -> AsyncIterable[dict[str, any]]:
+        """Runs every node that has not completed yet.
+
+        The nodes to run are fixed when the workflow starts, nodes added
+        while it runs are picked up by the next run. Completed nodes are
+        never run again. A node that asks for input pauses the workflow:
+        nodes already running finish and their chunks are still yielded,
+        but no further nodes are started. Only one question is yielded at
+        a time, a node asking while the workflow is paused is held and
+        its question is yielded once the paused node has been answered.
+        Running the workflow again resumes with the paused node and
+        everything that has not run, except nodes holding a question.
+        """
+        logger.info('Executing workflow graph')
+        http_clients = self.http_clients or get_http_clients()
+        sub_graph = set(self._unfinished)
+        logger.info(f'Sub graph {sub_graph} size {len(sub_graph)}')
+        self.state = Status.RUNNING
+
+        events: asyncio.Queue = asyncio.Queue()
+        running: dict[str, asyncio.Task] = {}
+
+        def start_ready_nodes():
+            if self.state == Status.PAUSED:
+                return
+            held = {node_id for node_id, _ in self._held_questions}
+            ready = [
+                n for n in self._ready if n in sub_graph and n not in held
+            ]
+            if start_node_id in ready:
+                # Start with the requested node when concurrency is limited.
+                ready.remove(start_node_id)
+                ready.insert(0, start_node_id)
+            for node_id in ready[: self.max_concurrency - len(running)]:
+                del self._ready[node_id]
+                running[node_id] = asyncio.create_task(
+                    self._run_node(node_id, events, http_clients)
+                )
+
+        def reset(node_id: str):
+            # The node did not finish, it can start again in the next run.
+            self.nodes[node_id].state = Status.READY
+            self._ready[node_id] = None
+
+        try:
+            start_ready_nodes()
+            while running:
+                node_id, chunk = await events.get()
+                node = self.nodes[node_id]
+                if chunk is _NODE_DONE:
+                    task = running.pop(node_id)
+                    if task.exception() is not None:
+                        reset(node_id)
+                        raise task.exception()
+                    if node.state == Status.RUNNING:
+                        self._complete(node_id)
+                    else:
+                        self._ready[node_id] = None
+                    start_ready_nodes()
+                    continue
+                # When the workflow node is paused, do not yeild any chunks
+                # but, let the node complete.
+                if node.state != Status.PAUSED:
+                    if isinstance(
+                        chunk.root, SendStreamingMessageSuccessResponse
+                    ) and (
+                        isinstance(chunk.root.result, TaskStatusUpdateEvent)
+                    ):
+                        task_status_event = chunk.root.result
+                        context_id = task_status_event.contextId
+                        if (
+                            task_status_event.status.state
+                            == TaskState.input_required
+                            and context_id
+                        ):
+                            node.state = Status.PAUSED
+                            if self.state == Status.PAUSED:
+                                # Another question is pending, ask this
+                                # one after it has been answered.
+                                self._held_questions.append((node.id, chunk))
+                                continue
+                            self.state = Status.PAUSED
+                            self.paused_node_id = node.id
+                    yield chunk
+        finally:
+            for task in running.values():
+                task.cancel()
+            await asyncio.gather(*running.values(), return_exceptions=True)
+            for node_id in running:
+                reset(node_id)
+        if self.state == Status.RUNNING and self._held_questions:
+            node_id, chunk = self._held_questions.popleft()
+            self.state = Status.PAUSED
+            self.paused_node_id = node_id
+            yield chunk
+        if self.state == Status.RUNNING:
+            self.state = Status.COMPLETED
+
+    async def _run_node(
+        self,
+        node_id: str,
+        events: asyncio.Queue,
+        http_clients: AgentHttpClients,
+    ) -> None:
+        node = self.nodes[node_id]
+        node.state = Status.RUNNING
+        query = self._attributes[node_id].get('query')
+        task_id = self._attributes[node_id].get('task_id')
+        context_id = self._attributes[node_id].get('context_id')
+        try:
+            async for chunk in node.run_node(
+                query, task_id, context_id, http_clients=http_clients
+            ):
+                events.put_nowait((node_id, chunk))
+        finally:
+            events.put_nowait((node_id, _NODE_DONE))
+
+    def _complete(self, node_id: str) -> None:
+        self.nodes[node_id].state = Status.COMPLETED
+        del self._unfinished[node_id]
+        for successor in self._successors[node_id]:
+            self._blocked_by[successor] -= 1
+            if (
+                self._blocked_by[successor] == 0
+                and successor in self._unfinished
+            ):
+                self._ready[successor] = None
+
+    def set_node_attribute(self, node_id, attribute, value):
+        if node_id in self._attributes:
+            self._attributes[node_id][attribute] = value
+
+    def set_node_attributes(self, node_id, attr_val):
+        if node_id in self._attributes:
+            self._attributes[node_id].update(attr_val)
+
+    def is_empty(self) -> bool:
+        return not self.nodes
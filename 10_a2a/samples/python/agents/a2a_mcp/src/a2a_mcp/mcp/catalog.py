@@ -0,0 +1,178 @@
+# type: ignore
+"""Hot-reloading agent card catalogue."""
+
+import json
+import logging
+import threading
+
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from itertools import count
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from a2a_mcp.mcp.embedding_index import NearestNeighbors
+
+
+logger = logging.getLogger(__name__)
+_generations = count()
+CARD_URI_PREFIX = 'resource://agent_cards/'
+EMPTY_CARD_RESOURCE = json.dumps({'agent_card': []})
+
+
+@dataclass(frozen=True)
+class CatalogSnapshot:
+    """An immutable view of the loaded agent cards.
+
+    Readers take the current snapshot once and use it for the whole
+    request, so a reload never changes the data under a running query.
+    The agent card resources are serialized once per snapshot, reads are
+    a dict lookup.
+    """
+
+    df: pd.DataFrame
+    search: NearestNeighbors
+    # resource://agent_cards/{card_name} response by card name.
+    card_resources: dict[str, str]
+    # resource://agent_cards/list response.
+    card_list_resource: str
+    # Changes on every reload, include it in cache keys derived from it.
+    generation: int = field(default_factory=lambda: next(_generations))
+
+    @classmethod
+    def from_dataframe(cls, df: pd.DataFrame | None) -> 'CatalogSnapshot':
+        if df is None or df.empty:
+            df = pd.DataFrame(
+                {'card_uri': [], 'agent_card': [], 'card_embeddings': []}
+            )
+            search = NearestNeighbors(np.empty((0, 0)))
+        else:
+            search = NearestNeighbors(np.stack(df['card_embeddings']))
+
+        cards_by_name: dict[str, list[dict]] = {}
+        for card_uri, agent_card in zip(
+            df['card_uri'], df['agent_card'], strict=True
+        ):
+            name = card_uri.removeprefix(CARD_URI_PREFIX)
+            cards_by_name.setdefault(name, []).append(agent_card)
+        card_resources = {
+            name: json.dumps({'agent_card': cards})
+            for name, cards in cards_by_name.items()
+        }
+        card_list_resource = json.dumps(
+            {'agent_cards': df['card_uri'].to_list()}
+        )
+        return cls(df, search, card_resources, card_list_resource)
+
+    def card_resource(self, card_name: str) -> str:
+        return self.card_resources.get(card_name, EMPTY_CARD_RESOURCE)
+
+
+class AgentCardCatalog:
+    """Keeps the agent cards in sync with the agent cards directory.
+
+    A background thread watches the directory, with watchfiles (inotify
+    and friends) when it is installed and by polling otherwise. On a
+    change the cards are loaded again, which only embeds new or changed
+    cards, and the new snapshot replaces the old one in a single
+    assignment.
+    """
+
+    def __init__(
+        self,
+        load: Callable[[], pd.DataFrame | None],
+        directory: str,
+        poll_interval: float = 2.0,
+    ):
+        """Loads the cards once.
+
+        Args:
+            load: Loads the cards and their embeddings, None on failure.
+            directory: The agent cards directory to watch.
+            poll_interval: Seconds between directory scans when polling.
+        """
+        self.load = load
+        self.directory = Path(directory)
+        self.poll_interval = poll_interval
+        self._fingerprint = self._scan()
+        self.snapshot = CatalogSnapshot.from_dataframe(load())
+        self._reload_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._watcher: threading.Thread | None = None
+
+    def reload(self) -> bool:
+        """Loads the cards again and publishes them.
+
+        Returns:
+            True if a new snapshot was published.
+        """
+        with self._reload_lock:
+            # Recorded first, a failed reload is retried on the next change
+            # rather than on every scan.
+            self._fingerprint = self._scan()
+            df = self.load()
+            if df is None and self._fingerprint:
+                # Keep serving the previous cards rather than none at all.
+                logger.error('Reloading agent cards failed, keeping old cards')
+                return False
+            self.snapshot = CatalogSnapshot.from_dataframe(df)
+            logger.info(f'Reloaded {len(self.snapshot.df)} agent cards')
+            return True
+
+    def watch(self) -> None:
+        """Starts watching the directory in a daemon thread."""
+        if self._watcher is not None:
+            return
+        try:
+            import watchfiles  # noqa: F401
+
+            target = self._watch_events
+        except ImportError:
+            target = self._poll
+        self._watcher = threading.Thread(
+            target=target, name='agent-card-watcher', daemon=True
+        )
+        self._watcher.start()
+
+    def stop(self, timeout: float = 5.0) -> None:
+        """Stops watching and waits for the watcher thread to exit.
+
+        The watcher must not be running at interpreter exit.
+        """
+        self._stop.set()
+        if self._watcher is not None:
+            self._watcher.join(timeout)
+            self._watcher = None
+
+    def _watch_events(self) -> None:
+        import watchfiles
+
+        for changes in watchfiles.watch(
+            self.directory, stop_event=self._stop
+        ):
+            if any(path.lower().endswith('.json') for _, path in changes):
+                self._reload_if_changed()
+
+    def _poll(self) -> None:
+        while not self._stop.wait(self.poll_interval):
+            self._reload_if_changed()
+
+    def _reload_if_changed(self) -> None:
+        try:
+            if self._scan() != self._fingerprint:
+                self.reload()
+        except Exception as e:
+            logger.error(f'Error reloading agent cards: {e}', exc_info=True)
+
+    def _scan(self) -> tuple:
+        """Returns (name, mtime, size) of every card file."""
+        if not self.directory.is_dir():
+            return ()
+        entries = []
+        for path in self.directory.iterdir():
+            if path.suffix.lower() == '.json' and path.is_file():
+                stat = path.stat()
+                entries.append((path.name, stat.st_mtime_ns, stat.st_size))
+        return tuple(sorted(entries))
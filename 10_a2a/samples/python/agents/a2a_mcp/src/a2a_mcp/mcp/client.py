@@ -0,0 +1,423 @@
+# type:ignore
+import asyncio
+import json
+import os
+import time
+import weakref
+
+from contextlib import asynccontextmanager
+
+import click
+
+from fastmcp.utilities.logging import get_logger
+from mcp import ClientSession, McpError, StdioServerParameters
+from mcp.client.sse import sse_client
+from mcp.client.stdio import stdio_client
+from mcp.types import CallToolResult, ReadResourceResult
+
+
+logger = get_logger(__name__)
+
+env = {
+    'GOOGLE_API_KEY': os.getenv('GOOGLE_API_KEY'),
+}
+
+
+@asynccontextmanager
+async def init_session(host, port, transport):
+    """Initializes and manages an MCP ClientSession based on the specified transport.
+
+    This asynchronous context manager establishes a connection to an MCP server
+    using either Server-Sent Events (SSE) or Standard I/O (STDIO) transport.
+    It handles the setup and teardown of the connection and yields an active
+    `ClientSession` object ready for communication.
+
+    Args:
+        host: The hostname or IP address of the MCP server (used for SSE).
+        port: The port number of the MCP server (used for SSE).
+        transport: The communication transport to use ('sse' or 'stdio').
+
+    Yields:
+        ClientSession: An initialized and ready-to-use MCP client session.
+
+    Raises:
+        ValueError: If an unsupported transport type is provided (implicitly,
+                    as it won't match 'sse' or 'stdio').
+        Exception: Other potential exceptions during client initialization or
+                   session setup.
+    """
+    if transport == 'sse':
+        url = f'http://{host}:{port}/sse'
+        async with sse_client(url) as (read_stream, write_stream):
+            async with ClientSession(
+                read_stream=read_stream, write_stream=write_stream
+            ) as session:
+                logger.debug('SSE ClientSession created, initializing...')
+                await session.initialize()
+                logger.info('SSE ClientSession initialized successfully.')
+                yield session
+    elif transport == 'stdio':
+        if not os.getenv('GOOGLE_API_KEY'):
+            logger.error('GOOGLE_API_KEY is not set')
+            raise ValueError('GOOGLE_API_KEY is not set')
+        stdio_params = StdioServerParameters(
+            command='uv',
+            args=['run', 'a2a-mcp'],
+            env=env,
+        )
+        async with stdio_client(stdio_params) as (read_stream, write_stream):
+            async with ClientSession(
+                read_stream=read_stream,
+                write_stream=write_stream,
+            ) as session:
+                logger.debug('STDIO ClientSession created, initializing...')
+                await session.initialize()
+                logger.info('STDIO ClientSession initialized successfully.')
+                yield session
+    else:
+        logger.error(f'Unsupported transport type: {transport}')
+        raise ValueError(
+            f"Unsupported transport type: {transport}. Must be 'sse' or 'stdio'."
+        )
+
+
+class _PooledSession:
+    """A session kept open by a background task.
+
+    The transports are anyio context managers that must be exited by the
+    task that entered them, so a dedicated task owns the connection and the
+    session is used from any task while it waits.
+    """
+
+    def __init__(self, host, port, transport):
+        self.host = host
+        self.port = port
+        self.transport = transport
+        self.session: ClientSession | None = None
+        self.last_used = 0.0
+        self.lock = asyncio.Lock()
+        self._task: asyncio.Task | None = None
+        self._closing: asyncio.Event | None = None
+
+    @property
+    def connected(self) -> bool:
+        return self.session is not None and not self._task.done()
+
+    async def connect(self):
+        await self.close()
+        ready = asyncio.Event()
+        self._closing = asyncio.Event()
+        error = None
+
+        async def hold_session():
+            nonlocal error
+            try:
+                async with init_session(
+                    self.host, self.port, self.transport
+                ) as session:
+                    self.session = session
+                    ready.set()
+                    await self._closing.wait()
+            except Exception as e:
+                error = e
+                logger.warning(f'MCP session closed: {e}')
+            finally:
+                self.session = None
+                ready.set()
+
+        self._task = asyncio.create_task(hold_session())
+        await ready.wait()
+        if self.session is None:
+            raise ConnectionError(f'Could not connect to MCP server: {error}')
+        self.last_used = time.monotonic()
+
+    async def close(self):
+        if self._task is None:
+            return
+        self._closing.set()
+        await asyncio.gather(self._task, return_exceptions=True)
+        self._task = None
+
+
+class MCPSessionPool:
+    """Long-lived MCP client sessions shared across requests.
+
+    Opening a session costs an SSE connect (or spawning the server with
+    stdio) plus the initialize handshake, a pooled call is a single RPC.
+    Requests on a session are multiplexed, so a few sessions serve many
+    concurrent callers. Sessions are opened on first use, pinged when they
+    have been idle for health_check_interval seconds, and reopened when
+    they fail.
+    """
+
+    def __init__(
+        self,
+        host,
+        port,
+        transport,
+        size: int = 2,
+        health_check_interval: float = 30.0,
+    ):
+        self.health_check_interval = health_check_interval
+        self._sessions = [
+            _PooledSession(host, port, transport) for _ in range(size)
+        ]
+        self._next = 0
+
+    async def call(self, fn, *args, **kwargs):
+        """Calls fn(session, *args, **kwargs) on a pooled session.
+
+        If the session fails, fn is retried once on a new session, so only
+        pass calls that are safe to repeat. Errors returned by the server
+        (McpError) are raised as they are.
+        """
+        pooled = await self._checkout()
+        session = pooled.session
+        try:
+            return await fn(session, *args, **kwargs)
+        except McpError:
+            raise
+        except Exception as e:
+            logger.warning(f'MCP session failed, reconnecting: {e}')
+            async with pooled.lock:
+                # Another caller may have reconnected it already.
+                if pooled.session is session or not pooled.connected:
+                    await pooled.connect()
+            return await fn(pooled.session, *args, **kwargs)
+        finally:
+            pooled.last_used = time.monotonic()
+
+    @asynccontextmanager
+    async def session(self):
+        """Yields a pooled session, for several calls in a row."""
+        pooled = await self._checkout()
+        try:
+            yield pooled.session
+        finally:
+            pooled.last_used = time.monotonic()
+
+    async def close(self):
+        for pooled in self._sessions:
+            await pooled.close()
+
+    async def _checkout(self) -> _PooledSession:
+        pooled = self._sessions[self._next % len(self._sessions)]
+        self._next += 1
+        async with pooled.lock:
+            if not pooled.connected:
+                await pooled.connect()
+            elif (
+                time.monotonic() - pooled.last_used
+                > self.health_check_interval
+            ):
+                try:
+                    await asyncio.wait_for(pooled.session.send_ping(), 5)
+                    pooled.last_used = time.monotonic()
+                except Exception as e:
+                    logger.warning(f'MCP session unhealthy, reconnecting: {e}')
+                    await pooled.connect()
+        return pooled
+
+
+# Event loop -> (host, port, transport) -> pool.
+_session_pools: weakref.WeakKeyDictionary[
+    asyncio.AbstractEventLoop, dict[tuple, MCPSessionPool]
+] = weakref.WeakKeyDictionary()
+
+
+def get_session_pool(host, port, transport) -> MCPSessionPool:
+    """Returns the session pool for a server, shared by the event loop.
+
+    Sessions are bound to the event loop they were opened in, a pool is
+    created per server and loop. Pools of closed loops are dropped.
+    """
+    for loop in list(_session_pools):
+        if loop.is_closed():
+            del _session_pools[loop]
+    pools = _session_pools.setdefault(asyncio.get_running_loop(), {})
+    key = (host, port, transport)
+    pool = pools.get(key)
+    if pool is None:
+        pool = pools[key] = MCPSessionPool(host, port, transport)
+    return pool
+
+
+async def find_agent(session: ClientSession, query) -> CallToolResult:
+    """Calls the 'find_agent' tool on the connected MCP server.
+
+    Args:
+        session: The active ClientSession.
+        query: The natural language query to send to the 'find_agent' tool.
+
+    Returns:
+        The result of the tool call.
+    """
+    logger.info(f"Calling 'find_agent' tool with query: '{query[:50]}...'")
+    return await session.call_tool(
+        name='find_agent',
+        arguments={
+            'query': query,
+        },
+    )
+
+
+async def find_agents(
+    session: ClientSession, query, k: int = 3, min_score: float = 0.0
+) -> CallToolResult:
+    """Calls the 'find_agents' tool on the connected MCP server.
+
+    Args:
+        session: The active ClientSession.
+        query: The natural language query to send to the 'find_agents' tool.
+        k: Maximum number of agent cards to return.
+        min_score: Minimum similarity score of a returned card.
+
+    Returns:
+        The result of the tool call, ranked agent cards with their scores.
+    """
+    logger.info(f"Calling 'find_agents' tool with query: '{query[:50]}...'")
+    return await session.call_tool(
+        name='find_agents',
+        arguments={
+            'query': query,
+            'k': k,
+            'min_score': min_score,
+        },
+    )
+
+
+async def find_resource(session: ClientSession, resource) -> ReadResourceResult:
+    """Reads a resource from the connected MCP server.
+
+    Args:
+        session: The active ClientSession.
+        resource: The URI of the resource to read (e.g., 'resource://agent_cards/list').
+
+    Returns:
+        The result of the resource read operation.
+    """
+    logger.info(f'Reading resource: {resource}')
+    return await session.read_resource(resource)
+
+
+async def search_flights(session: ClientSession) -> CallToolResult:
+    """Calls the 'search_flights' tool on the connected MCP server.
+
+    Args:
+        session: The active ClientSession.
+        query: The natural language query to send to the 'search_flights' tool.
+
+    Returns:
+        The result of the tool call.
+    """
+    # TODO: Implementation pending
+    logger.info("Calling 'search_flights' tool'")
+    return await session.call_tool(
+        name='search_flights',
+        arguments={
+            'departure_airport': 'SFO',
+            'arrival_airport': 'LHR',
+            'start_date': '2025-06-03',
+            'end_date': '2025-06-09',
+        },
+    )
+
+
+async def search_hotels(session: ClientSession) -> CallToolResult:
+    """Calls the 'search_hotels' tool on the connected MCP server.
+
+    Args:
+        session: The active ClientSession.
+        query: The natural language query to send to the 'search_hotels' tool.
+
+    Returns:
+        The result of the tool call.
+    """
+    # TODO: Implementation pending
+    logger.info("Calling 'search_hotels' tool'")
+    return await session.call_tool(
+        name='search_hotels',
+        arguments={
+            'location': 'A Suite room in St Pancras Square in London',
+            'check_in_date': '2025-06-03',
+            'check_out_date': '2025-06-09',
+        },
+    )
+
+
+async def query_db(session: ClientSession) -> CallToolResult:
+    """Calls the 'query' tool on the connected MCP server.
+
+    Args:
+        session: The active ClientSession.
+        query: The natural language query to send to the 'query_db' tool.
+
+    Returns:
+        The result of the tool call.
+    """
+    logger.info("Calling 'query_db' tool'")
+    return await session.call_tool(
+        name='query_travel_data',
+        arguments={
+            'query': "SELECT id, name, city, hotel_type, room_type, price_per_night FROM hotels WHERE city='London'",
+        },
+    )
+
+
+# Test util
+async def main(host, port, transport, query, resource, tool):
+    """Main asynchronous function to connect to the MCP server and execute commands.
+
+    Used for local testing.
+
+    Args:
+        host: Server hostname.
+        port: Server port.
+        transport: Connection transport ('sse' or 'stdio').
+        query: Optional query string for the 'find_agent' tool.
+        resource: Optional resource URI to read.
+        tool: Optional tool name to execute. Valid options are:
+            'search_flights', 'search_hotels', or 'query_db'.
+    """
+    logger.info('Starting Client to connect to MCP')
+    async with init_session(host, port, transport) as session:
+        if query:
+            result = await find_agent(session, query)
+            data = json.loads(result.content[0].text)
+            logger.info(json.dumps(data, indent=2))
+        if resource:
+            result = await find_resource(session, resource)
+            logger.info(result)
+            data = json.loads(result.contents[0].text)
+            logger.info(json.dumps(data, indent=2))
+        if tool:
+            if tool == 'search_flights':
+                results = await search_flights(session)
+                logger.info(results.model_dump())
+            if tool == 'search_hotels':
+                result = await search_hotels(session)
+                data = json.loads(result.content[0].text)
+                logger.info(json.dumps(data, indent=2))
+            if tool == 'query_db':
+                result = await query_db(session)
+                logger.info(result)
+                data = json.loads(result.content[0].text)
+                logger.info(json.dumps(data, indent=2))
+
+
+# Command line tester
+@click.command()
+@click.option('--host', default='localhost', help='SSE Host')
+@click.option('--port', default='10100', help='SSE Port')
+@click.option('--transport', default='stdio', help='MCP Transport')
+@click.option('--find_agent', help='Query to find an agent')
+@click.option('--resource', help='URI of the resource to locate')
+@click.option('--tool_name', type=click.Choice(['search_flights', 'search_hotels', 'query_db']),
+              help='Tool to execute: search_flights, search_hotels, or query_db')
+def cli(host, port, transport, find_agent, resource, tool_name):
+    """A command-line client to interact with the Agent Cards MCP server."""
+    asyncio.run(main(host, port, transport, find_agent, resource, tool_name))
+
+
+if __name__ == '__main__':
+    cli()
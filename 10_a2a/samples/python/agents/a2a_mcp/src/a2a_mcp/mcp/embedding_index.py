@@ -0,0 +1,418 @@
+# type: ignore
+"""Persistent embedding index for agent cards."""
+
+import hashlib
+import json
+import logging
+import os
+import re
+import tempfile
+import threading
+import time
+
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from collections.abc import Hashable
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+
+
+logger = logging.getLogger(__name__)
+MANIFEST_FILE = 'manifest.json'
+
+
+class Embedder(ABC):
+    """Turns text into embedding vectors."""
+
+    # Identifies the model, embeddings of different models are not reused.
+    name: str
+
+    @abstractmethod
+    def embed_documents(self, texts: list[str]) -> np.ndarray:
+        """Embeds documents, one row per text."""
+
+    @abstractmethod
+    def embed_query(self, text: str) -> np.ndarray:
+        """Embeds a search query."""
+
+
+class GenAIEmbedder(Embedder):
+    """Embeds text with a Google Generative AI embedding model."""
+
+    def __init__(self, model: str = 'models/embedding-001', batch_size=100):
+        """Initializes the embedder.
+
+        Args:
+            model: The embedding model.
+            batch_size: Texts sent per embedding request.
+        """
+        self.name = model
+        self.model = model
+        self.batch_size = batch_size
+
+    def embed_documents(self, texts: list[str]) -> np.ndarray:
+        import google.generativeai as genai
+
+        embeddings = []
+        for start in range(0, len(texts), self.batch_size):
+            embeddings.extend(
+                genai.embed_content(
+                    model=self.model,
+                    content=texts[start : start + self.batch_size],
+                    task_type='retrieval_document',
+                )['embedding']
+            )
+        return np.asarray(embeddings, dtype=np.float32)
+
+    def embed_query(self, text: str) -> np.ndarray:
+        import google.generativeai as genai
+
+        return np.asarray(
+            genai.embed_content(
+                model=self.model, content=text, task_type='retrieval_query'
+            )['embedding'],
+            dtype=np.float32,
+        )
+
+
+class HashingEmbedder(Embedder):
+    """Deterministic local embedder based on hashed word counts.
+
+    Needs no network access or credentials, which makes it suitable for
+    tests and offline development. Texts sharing words score higher.
+    """
+
+    def __init__(self, dim: int = 256):
+        self.name = f'hashing-{dim}'
+        self.dim = dim
+
+    def embed_documents(self, texts: list[str]) -> np.ndarray:
+        return np.stack([self.embed_query(text) for text in texts])
+
+    def embed_query(self, text: str) -> np.ndarray:
+        vector = np.zeros(self.dim, dtype=np.float32)
+        for word in re.findall(r'\w+', text.lower()):
+            digest = hashlib.blake2b(word.encode(), digest_size=8).digest()
+            vector[int.from_bytes(digest, 'little') % self.dim] += 1.0
+        return vector
+
+
+def normalize_query(text: str) -> str:
+    """Normalizes case and whitespace, so trivially different queries match."""
+    return ' '.join(text.casefold().split())
+
+
+class LRUCache:
+    """A thread-safe LRU cache whose entries optionally expire."""
+
+    def __init__(self, maxsize: int = 4096, ttl: float | None = None):
+        """Initializes the cache.
+
+        Args:
+            maxsize: Maximum number of entries.
+            ttl: Seconds an entry stays valid, None for no expiry.
+        """
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return default
+            stored_at, value = entry
+            if self.ttl is not None and time.monotonic() - stored_at > self.ttl:
+                del self._data[key]
+                return default
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key: Hashable, value: Any) -> None:
+        with self._lock:
+            self._data[key] = (time.monotonic(), value)
+            self._data.move_to_end(key)
+            if len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+
+class CachedEmbedder(Embedder):
+    """Wraps an embedder and caches its query embeddings.
+
+    Queries are cached by model and normalized text, so repeated routing
+    of the same task skips the embedding API. Document embeddings are
+    already persisted by AgentCardIndex and pass through.
+    """
+
+    def __init__(self, embedder: Embedder, maxsize: int = 4096):
+        self.name = embedder.name
+        self.embedder = embedder
+        self.cache = LRUCache(maxsize)
+
+    def embed_documents(self, texts: list[str]) -> np.ndarray:
+        return self.embedder.embed_documents(texts)
+
+    def embed_query(self, text: str) -> np.ndarray:
+        key = (self.name, normalize_query(text))
+        embedding = self.cache.get(key)
+        if embedding is None:
+            embedding = self.embedder.embed_query(text)
+            self.cache.set(key, embedding)
+        return embedding
+
+
+def card_text(agent_card: dict) -> str:
+    """Returns the text embedded for an agent card."""
+    return json.dumps(agent_card)
+
+
+class AgentCardIndex:
+    """Agent card embeddings persisted across server restarts.
+
+    The index directory holds a float32 .npy matrix and a manifest mapping
+    the SHA-256 of each embedded card text to its row.
+    Building the index only embeds cards whose content is not in the
+    manifest yet, in batches, and reuses every other row.
+    """
+
+    def __init__(self, directory: str, embedder: Embedder):
+        """Initializes the index.
+
+        Args:
+            directory: Where the matrix and manifest are stored.
+            embedder: Computes embeddings for new or changed cards.
+        """
+        self.directory = Path(directory)
+        self.embedder = embedder
+
+    def build(self, agent_cards: list[dict]) -> np.ndarray:
+        """Returns the embeddings of the given cards, one row per card.
+
+        Args:
+            agent_cards: The agent cards, in the order of the result rows.
+
+        Returns:
+            A float32 matrix with one embedding per card.
+        """
+        texts = [card_text(card) for card in agent_cards]
+        hashes = [hashlib.sha256(text.encode()).hexdigest() for text in texts]
+        manifest, stored = self._load()
+        rows = manifest.get('rows', {})
+
+        # Embed each new or changed card once, in batches.
+        missing = {}
+        for text, content_hash in zip(texts, hashes, strict=True):
+            if content_hash not in rows:
+                missing.setdefault(content_hash, text)
+        logger.info(
+            f'Embedding index: {len(agent_cards) - len(missing)} cards '
+            f'reused, {len(missing)} to embed'
+        )
+        embedded = {}
+        if missing:
+            embeddings = self.embedder.embed_documents(list(missing.values()))
+            embedded = dict(zip(missing, embeddings, strict=True))
+
+        if not hashes:
+            return np.empty((0, 0), dtype=np.float32)
+        matrix = np.stack(
+            [
+                embedded[h] if h in embedded else stored[rows[h]]
+                for h in hashes
+            ]
+        ).astype(np.float32, copy=False)
+
+        if missing or set(rows) != set(hashes):
+            self._save(manifest, hashes, matrix)
+        return matrix
+
+    def _load(self) -> tuple[dict, np.ndarray | None]:
+        try:
+            with (self.directory / MANIFEST_FILE).open(
+                'r', encoding='utf-8'
+            ) as f:
+                manifest = json.load(f)
+            if manifest.get('embedder') != self.embedder.name:
+                logger.info('Embedding index was built by another embedder')
+                # Keep the matrix name only, so the stale file is removed.
+                return {'matrix': manifest['matrix']}, None
+            stored = np.load(
+                self.directory / manifest['matrix'], mmap_mode='r'
+            )
+            return manifest, stored
+        except FileNotFoundError:
+            return {}, None
+        except (OSError, ValueError, KeyError) as e:
+            logger.warning(f'Ignoring unreadable embedding index: {e}')
+            return {}, None
+
+    def _save(self, old_manifest: dict, hashes: list[str], matrix):
+        """Writes a new matrix file, then switches the manifest to it.
+
+        Replacing the manifest is the commit point, so a crash never pairs
+        a manifest with the rows of another matrix.
+        """
+        self.directory.mkdir(parents=True, exist_ok=True)
+        rows = {}
+        for row, content_hash in enumerate(hashes):
+            rows.setdefault(content_hash, row)
+
+        fd, tmp_path = tempfile.mkstemp(
+            dir=self.directory, prefix='embeddings-', suffix='.npy'
+        )
+        with os.fdopen(fd, 'wb') as f:
+            np.save(f, matrix)
+
+        fd, manifest_path = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump(
+                {
+                    'embedder': self.embedder.name,
+                    'matrix': os.path.basename(tmp_path),
+                    'rows': rows,
+                },
+                f,
+            )
+        os.replace(manifest_path, self.directory / MANIFEST_FILE)
+
+        if 'matrix' in old_manifest:
+            try:
+                os.remove(self.directory / old_manifest['matrix'])
+            except OSError as e:
+                logger.warning(f'Could not remove old embeddings: {e}')
+
+
+def _top_k(scores: np.ndarray, k: int) -> np.ndarray:
+    """Returns the positions of the k highest scores, best first."""
+    if k < len(scores):
+        top = np.argpartition(-scores, k - 1)[:k]
+    else:
+        top = np.arange(len(scores))
+    return top[np.argsort(-scores[top], kind='stable')]
+
+
+class NearestNeighbors:
+    """Top-k cosine similarity search over a fixed set of embeddings.
+
+    Rows are L2-normalized once into a contiguous float32 matrix, so a
+    query costs one matrix-vector product and an argpartition. From
+    ann_threshold rows on, an inverted file (IVF) index is built with
+    spherical k-means, and a query only scores the rows of the n_probe
+    lists whose centroids are closest to it. Results are then approximate.
+    """
+
+    def __init__(
+        self,
+        embeddings: np.ndarray,
+        ann_threshold: int = 20_000,
+        n_probe: int = 8,
+        seed: int = 0,
+    ):
+        """Builds the search structures.
+
+        Args:
+            embeddings: One embedding per row.
+            ann_threshold: Row count from which the IVF index is used.
+            n_probe: Lists scored per query by the IVF index.
+            seed: Seed for the k-means initialization.
+        """
+        self.matrix = self._normalize(
+            np.ascontiguousarray(embeddings, dtype=np.float32)
+        )
+        self.n_probe = n_probe
+        self.centroids = None
+        if len(self.matrix) >= ann_threshold:
+            self._build_ivf(np.random.default_rng(seed))
+
+    def __len__(self) -> int:
+        return len(self.matrix)
+
+    def search(
+        self, query: np.ndarray, k: int = 1, min_score: float | None = None
+    ) -> list[tuple[int, float]]:
+        """Finds the rows most similar to a query.
+
+        Args:
+            query: The query embedding.
+            k: Maximum number of results.
+            min_score: Results with a lower cosine similarity are dropped.
+
+        Returns:
+            (row, score) pairs, best first.
+        """
+        if not len(self.matrix) or k < 1:
+            return []
+        query = self._normalize(np.asarray(query, dtype=np.float32))
+        if self.centroids is None:
+            candidates = None
+            scores = self.matrix @ query
+        else:
+            lists = _top_k(self.centroids @ query, self.n_probe)
+            candidates = np.concatenate(
+                [
+                    self._list_rows[
+                        self._list_bounds[i] : self._list_bounds[i + 1]
+                    ]
+                    for i in lists
+                ]
+            )
+            scores = self.matrix[candidates] @ query
+
+        results = []
+        for position in _top_k(scores, k):
+            score = float(scores[position])
+            if min_score is not None and score < min_score:
+                break
+            row = position if candidates is None else candidates[position]
+            results.append((int(row), score))
+        return results
+
+    @staticmethod
+    def _normalize(vectors: np.ndarray) -> np.ndarray:
+        norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+        return vectors / np.where(norms == 0, 1, norms)
+
+    def _build_ivf(self, rng: np.random.Generator, iterations: int = 10):
+        n_lists = int(np.sqrt(len(self.matrix)))
+        # Like other IVF implementations, train on a sample of the rows.
+        sample_size = min(len(self.matrix), 64 * n_lists)
+        sample = self.matrix[
+            np.sort(rng.choice(len(self.matrix), sample_size, replace=False))
+        ]
+        centroids = sample[rng.choice(sample_size, n_lists, replace=False)]
+        for _ in range(iterations):
+            assignments = self._assign(sample, centroids)
+            order = np.argsort(assignments, kind='stable')
+            counts = np.bincount(assignments, minlength=n_lists)
+            starts = np.concatenate([[0], np.cumsum(counts)[:-1]])
+            # Lists that lost all rows keep their previous centroid.
+            filled = counts > 0
+            sums = centroids.copy()
+            sums[filled] = np.add.reduceat(
+                sample[order], starts[filled], axis=0
+            )
+            centroids = self._normalize(sums)
+
+        assignments = self._assign(self.matrix, centroids)
+        self.centroids = centroids
+        self._list_rows = np.argsort(assignments, kind='stable')
+        self._list_bounds = np.concatenate(
+            [[0], np.cumsum(np.bincount(assignments, minlength=n_lists))]
+        )
+
+    @staticmethod
+    def _assign(vectors, centroids: np.ndarray, chunk: int = 65536):
+        # Chunked so the row x centroid score matrix stays small.
+        return np.concatenate(
+            [
+                np.argmax(vectors[start : start + chunk] @ centroids.T, 1)
+                for start in range(0, len(vectors), chunk)
+            ]
+        )
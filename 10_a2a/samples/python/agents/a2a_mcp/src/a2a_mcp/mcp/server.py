@@ -0,0 +1,344 @@
+# type: ignore
+import json
+import os
+import sqlite3
+import traceback
+
+from pathlib import Path
+
+import pandas as pd
+import requests
+
+from a2a_mcp.common.utils import init_api_key
+from a2a_mcp.mcp.catalog import AgentCardCatalog
+from a2a_mcp.mcp.embedding_index import (
+    AgentCardIndex,
+    CachedEmbedder,
+    Embedder,
+    GenAIEmbedder,
+    LRUCache,
+    normalize_query,
+)
+from mcp.server.fastmcp import FastMCP
+from mcp.server.fastmcp.utilities.logging import get_logger
+
+
+logger = get_logger(__name__)
+AGENT_CARDS_DIR = 'agent_cards'
+EMBEDDING_INDEX_DIR = 'agent_card_index'
+MODEL = 'models/embedding-001'
+# Seconds a routing decision is reused for the same query.
+ROUTING_CACHE_TTL = 300
+SQLLITE_DB = 'travel_agency.db'
+PLACES_API_URL = 'https://places.googleapis.com/v1/places:searchText'
+
+
+def load_agent_cards():
+    """Loads agent card data from JSON files within a specified directory.
+
+    Returns:
+        A list containing JSON data from an agent card file found in the specified directory.
+        Returns an empty list if the directory is empty, contains no '.json' files,
+        or if all '.json' files encounter errors during processing.
+    """
+    card_uris = []
+    agent_cards = []
+    dir_path = Path(AGENT_CARDS_DIR)
+    if not dir_path.is_dir():
+        logger.error(
+            f'Agent cards directory not found or is not a directory: {AGENT_CARDS_DIR}'
+        )
+        return card_uris, agent_cards
+
+    logger.info(f'Loading agent cards from card repo: {AGENT_CARDS_DIR}')
+
+    for filename in os.listdir(AGENT_CARDS_DIR):
+        if filename.lower().endswith('.json'):
+            file_path = dir_path / filename
+
+            if file_path.is_file():
+                logger.info(f'Reading file: {filename}')
+                try:
+                    with file_path.open('r', encoding='utf-8') as f:
+                        data = json.load(f)
+                        card_uris.append(
+                            f'resource://agent_cards/{Path(filename).stem}'
+                        )
+                        agent_cards.append(data)
+                except json.JSONDecodeError as jde:
+                    logger.error(f'JSON Decoder Error {jde}')
+                except OSError as e:
+                    logger.error(f'Error reading file {filename}: {e}.')
+                except Exception as e:
+                    logger.error(
+                        f'An unexpected error occurred processing {filename}: {e}',
+                        exc_info=True,
+                    )
+    logger.info(
+        f'Finished loading agent cards. Found {len(agent_cards)} cards.'
+    )
+    return card_uris, agent_cards
+
+
+def build_agent_card_embeddings(
+    embedder: Embedder | None = None,
+) -> pd.DataFrame:
+    """Loads agent cards, generates embeddings for them, and returns a DataFrame.
+
+    Embeddings are kept in an on-disk index in EMBEDDING_INDEX_DIR, only
+    new or changed cards are sent to the embedder.
+
+    Args:
+        embedder: Computes the embeddings, defaults to the Google
+            Generative AI model.
+
+    Returns:
+        Optional[pd.DataFrame]: A Pandas DataFrame containing the original
+        'agent_card' data and their corresponding 'Embeddings'. Returns None
+        if no agent cards were loaded initially or if an exception occurred
+        during the embedding generation process.
+    """
+    card_uris, agent_cards = load_agent_cards()
+    logger.info('Generating Embeddings for agent cards')
+    try:
+        if agent_cards:
+            df = pd.DataFrame(
+                {'card_uri': card_uris, 'agent_card': agent_cards}
+            )
+            index = AgentCardIndex(
+                EMBEDDING_INDEX_DIR, embedder or GenAIEmbedder(MODEL)
+            )
+            df['card_embeddings'] = list(index.build(agent_cards))
+            return df
+        logger.info('Done generating embeddings for agent cards')
+    except Exception as e:
+        logger.error(f'An unexpected error occurred : {e}.', exc_info=True)
+        return None
+
+
+def serve(host, port, transport, embedder: Embedder | None = None):  # noqa: PLR0915
+    """Initializes and runs the Agent Cards MCP server.
+
+    Args:
+        host: The hostname or IP address to bind the server to.
+        port: The port number to bind the server to.
+        transport: The transport mechanism for the MCP server (e.g., 'stdio', 'sse').
+        embedder: Computes card and query embeddings, defaults to the
+            Google Generative AI model.
+
+    Raises:
+        ValueError: If the 'GOOGLE_API_KEY' environment variable is not set
+            and no embedder is given.
+    """
+    if embedder is None:
+        init_api_key()
+        embedder = GenAIEmbedder(MODEL)
+    logger.info('Starting Agent Cards MCP Server')
+    mcp = FastMCP('agent-cards', host=host, port=port)
+
+    embedder = CachedEmbedder(embedder)
+    # Cards are reloaded when the agent cards directory changes. The search
+    # matrix is normalized once per reload, queries only score against it.
+    catalog = AgentCardCatalog(
+        lambda: build_agent_card_embeddings(embedder), AGENT_CARDS_DIR
+    )
+    catalog.watch()
+    routes = LRUCache(ttl=ROUTING_CACHE_TTL)
+
+    def route(query: str, k: int, min_score: float | None = None):
+        """Returns the snapshot searched and its (row, score) matches.
+
+        Matches are cached per normalized query and catalogue generation,
+        so a reload never serves rows of the previous cards.
+        """
+        snapshot = catalog.snapshot
+        key = (snapshot.generation, normalize_query(query), k, min_score)
+        matches = routes.get(key)
+        if matches is None:
+            matches = snapshot.search.search(
+                embedder.embed_query(query), k=k, min_score=min_score
+            )
+            routes.set(key, matches)
+        return snapshot, matches
+
+    @mcp.tool(
+        name='find_agent',
+        description='Finds the most relevant agent card based on a natural language query string.',
+    )
+    def find_agent(query: str) -> str:
+        """Finds the most relevant agent card based on a query string.
+
+        This function takes a user query, typically a natural language question or a task generated by an agent,
+        generates its embedding, and compares it against the
+        pre-computed embeddings of the loaded agent cards. It uses cosine
+        similarity and identifies the agent card with the highest score.
+
+        Args:
+            query: The natural language query string used to search for a
+                   relevant agent.
+
+        Returns:
+            The json representing the agent card deemed most relevant
+            to the input query based on embedding similarity.
+        """
+        snapshot, matches = route(query, k=1)
+        if not matches:
+            raise ValueError('No agent cards are loaded')
+        [(best_match_index, score)] = matches
+        logger.debug(
+            f'Found best match at index {best_match_index} with score {score}'
+        )
+        return snapshot.df.iloc[best_match_index]['agent_card']
+
+    @mcp.tool(
+        name='find_agents',
+        description='Finds the agent cards most relevant to a natural language query string, ranked by score.',
+    )
+    def find_agents(query: str, k: int = 3, min_score: float = 0.0) -> list:
+        """Finds the agent cards most relevant to a query string.
+
+        Returning several ranked candidates lets the caller fall back to the
+        next agent without asking the server again.
+
+        Args:
+            query: The natural language query string used to search for
+                   relevant agents.
+            k: Maximum number of agent cards to return.
+            min_score: Minimum cosine similarity of a returned card.
+
+        Returns:
+            A list of {'agent_card': ..., 'score': ...} entries, best first.
+        """
+        snapshot, matches = route(query, k=k, min_score=min_score)
+        return [
+            {
+                'agent_card': snapshot.df.iloc[index]['agent_card'],
+                'score': score,
+            }
+            for index, score in matches
+        ]
+
+    @mcp.tool()
+    def query_places_data(query: str):
+        """Query Google Places."""
+        logger.info(f'Search for places : {query}')
+        api_key = os.getenv('GOOGLE_PLACES_API_KEY')
+        if not api_key:
+            logger.info('GOOGLE_PLACES_API_KEY is not set')
+            return {'places': []}
+
+        headers = {
+            'X-Goog-Api-Key': api_key,
+            'X-Goog-FieldMask': 'places.id,places.displayName,places.formattedAddress',
+            'Content-Type': 'application/json',
+        }
+        payload = {
+            'textQuery': query,
+            'languageCode': 'en',
+            'maxResultCount': 10,
+        }
+
+        try:
+            response = requests.post(
+                PLACES_API_URL, headers=headers, json=payload
+            )
+            response.raise_for_status()
+            return response.json()
+        except requests.exceptions.HTTPError as http_err:
+            logger.info(f'HTTP error occurred: {http_err}')
+            logger.info(f'Response content: {response.text}')
+        except requests.exceptions.ConnectionError as conn_err:
+            logger.info(f'Connection error occurred: {conn_err}')
+        except requests.exceptions.Timeout as timeout_err:
+            logger.info(f'Timeout error occurred: {timeout_err}')
+        except requests.exceptions.RequestException as req_err:
+            logger.info(
+                f'An unexpected error occurred with the request: {req_err}'
+            )
+        except json.JSONDecodeError:
+            logger.info(
+                f'Failed to decode JSON response. Raw response: {response.text}'
+            )
+
+        return {'places': []}
+
+    @mcp.tool()
+    def query_travel_data(query: str) -> dict:
+        """ "name": "query_travel_data",
+        "description": "Retrieves the most up-to-date, ariline, hotel and car rental availability. Helps with the booking.
+        This tool should be used when a user asks for the airline ticket booking, hotel or accommodation booking, or car rental reservations.",
+        "parameters": {
+            "type": "object",
+            "properties": {
+            "query": {
+                "type": "string",
+                "description": "A SQL to run against the travel database."
+            }
+            },
+            "required": ["query"]
+        }
+        """
+        # The above is to influence gemini to pickup the tool.
+        logger.info(f'Query sqllite : {query}')
+
+        if not query or not query.strip().upper().startswith('SELECT'):
+            raise ValueError(f'In correct query {query}')
+
+        try:
+            with sqlite3.connect(SQLLITE_DB) as conn:
+                conn.row_factory = sqlite3.Row
+                cursor = conn.cursor()
+                cursor.execute(query)
+                rows = cursor.fetchall()
+                result = {'results': [dict(row) for row in rows]}
+                return json.dumps(result)
+        except Exception as e:
+            logger.error(f'Exception running query {e}')
+            logger.error(traceback.format_exc())
+            if 'no such column' in e:
+                return {
+                    'error': f'Please check your query, {e}. Use the table schema to regenerate the query'
+                }
+            return {'error': {e}}
+
+    @mcp.resource('resource://agent_cards/list', mime_type='application/json')
+    def get_agent_cards() -> str:
+        """Retrieves all loaded agent cards as a json / dictionary for the MCP resource endpoint.
+
+        This function serves as the handler for the MCP resource identified by
+        the URI 'resource://agent_cards/list'.
+
+        Returns:
+            A json structured as {'agent_cards': [...]}, where the value is a
+            list containing the URIs of all the loaded agent cards. Returns
+            {'agent_cards': []} if no cards are loaded. The json is built
+            once per catalogue reload.
+        """
+        logger.info('Starting read resources')
+        return catalog.snapshot.card_list_resource
+
+    @mcp.resource(
+        'resource://agent_cards/{card_name}', mime_type='application/json'
+    )
+    def get_agent_card(card_name: str) -> str:
+        """Retrieves an agent card as a json / dictionary for the MCP resource endpoint.
+
+        This function serves as the handler for the MCP resource identified by
+        the URI 'resource://agent_cards/{card_name}'.
+
+        Returns:
+            A json structured as {'agent_card': [...]}, looked up by card
+            name in the pre-serialized resources of the catalogue.
+        """
+        logger.info(
+            f'Starting read resource resource://agent_cards/{card_name}'
+        )
+        return catalog.snapshot.card_resource(card_name)
+
+    logger.info(
+        f'Agent cards MCP Server at {host}:{port} and transport {transport}'
+    )
+    try:
+        mcp.run(transport=transport)
+    finally:
+        catalog.stop()
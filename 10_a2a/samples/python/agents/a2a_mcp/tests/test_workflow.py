@@ -0,0 +1,146 @@
+import asyncio
+
+from a2a.types import (
+    Message,
+    Part,
+    SendStreamingMessageResponse,
+    SendStreamingMessageSuccessResponse,
+    TaskState,
+    TaskStatus,
+    TaskStatusUpdateEvent,
+    TextPart,
+)
+from a2a_mcp.common.workflow import Status, WorkflowGraph, WorkflowNode
+
+
+def status_chunk(state: TaskState) -> SendStreamingMessageResponse:
+    return SendStreamingMessageResponse(
+        root=SendStreamingMessageSuccessResponse(
+            id='1',
+            result=TaskStatusUpdateEvent(
+                taskId='task',
+                contextId='context',
+                final=False,
+                status=TaskStatus(
+                    state=state,
+                    message=Message(
+                        role='agent',
+                        messageId='message',
+                        parts=[Part(root=TextPart(text='question?'))],
+                    ),
+                ),
+            ),
+        )
+    )
+
+
+class FakeNode(WorkflowNode):
+    """Runs without an agent, asking for input on its first run if told."""
+
+    def __init__(self, name: str, delay: float, ask: bool = False):
+        super().__init__(task=name)
+        self.delay = delay
+        self.ask = ask
+        self.queries = []
+
+    async def run_node(self, query, task_id, context_id, http_clients=None):
+        self.queries.append(query)
+        await asyncio.sleep(self.delay)
+        if self.ask and len(self.queries) == 1:
+            yield status_chunk(TaskState.input_required)
+            return
+        yield status_chunk(TaskState.completed)
+
+
+def add_nodes(graph: WorkflowGraph, parent: FakeNode, *nodes: FakeNode):
+    for node in nodes:
+        graph.add_node(node)
+        graph.set_node_attribute(node.id, 'query', node.task)
+        if parent is not None:
+            graph.add_edge(parent.id, node.id)
+
+
+async def collect(graph: WorkflowGraph, start_node_id=None) -> list[str]:
+    return [
+        chunk.root.result.status.state
+        async for chunk in graph.run_workflow(start_node_id)
+    ]
+
+
+def test_independent_nodes_run_in_parallel():
+    async def run():
+        graph = WorkflowGraph()
+        planner = FakeNode('planner', 0.0)
+        tasks = [FakeNode(name, 0.2) for name in ('flight', 'hotel', 'car')]
+        add_nodes(graph, None, planner)
+        add_nodes(graph, planner, *tasks)
+        started = asyncio.get_running_loop().time()
+        states = await collect(graph, planner.id)
+        elapsed = asyncio.get_running_loop().time() - started
+        return graph, [planner, *tasks], states, elapsed
+
+    graph, nodes, states, elapsed = asyncio.run(run())
+    assert graph.state == Status.COMPLETED
+    assert states == [TaskState.completed] * 4
+    assert all(node.state == Status.COMPLETED for node in nodes)
+    # Sequential runs would take 0.6s.
+    assert elapsed < 0.5
+
+
+def test_pause_and_resume_with_held_questions():
+    async def run():
+        graph = WorkflowGraph()
+        flight = FakeNode('flight', 0.01, ask=True)
+        hotel = FakeNode('hotel', 0.02, ask=True)
+        car = FakeNode('car', 0.03)
+        add_nodes(graph, None, flight, hotel, car)
+
+        rounds = [await collect(graph)]
+        paused = [graph.paused_node_id]
+        while graph.state == Status.PAUSED:
+            node = graph.nodes[graph.paused_node_id]
+            graph.set_node_attribute(node.id, 'query', f'answer {node.task}')
+            rounds.append(await collect(graph, node.id))
+            paused.append(graph.paused_node_id)
+        return graph, (flight, hotel, car), rounds, paused
+
+    graph, (flight, hotel, car), rounds, paused = asyncio.run(run())
+    # One question per round: hotel's question is held until flight's
+    # has been answered.
+    assert rounds == [
+        [TaskState.input_required, TaskState.completed],
+        [TaskState.completed, TaskState.input_required],
+        [TaskState.completed],
+    ]
+    assert paused[:2] == [flight.id, hotel.id]
+    assert flight.queries == ['flight', 'answer flight']
+    assert hotel.queries == ['hotel', 'answer hotel']
+    assert car.queries == ['car']
+    assert graph.state == Status.COMPLETED
+
+
+def test_node_error_cancels_running_nodes_and_is_retried():
+    class FailingNode(FakeNode):
+        async def run_node(self, *args, **kwargs):
+            self.queries.append(args[0])
+            await asyncio.sleep(self.delay)
+            raise RuntimeError('agent failed')
+            yield
+
+    async def run():
+        graph = WorkflowGraph()
+        slow = FakeNode('slow', 5)
+        failing = FailingNode('failing', 0.01)
+        add_nodes(graph, None, slow, failing)
+        try:
+            await collect(graph)
+        except RuntimeError as e:
+            error = e
+        return graph, slow, failing, error
+
+    graph, slow, failing, error = asyncio.run(run())
+    assert str(error) == 'agent failed'
+    # Both can run again in the next run.
+    assert slow.state == Status.READY
+    assert failing.state == Status.READY
+    assert set(graph._ready) == {slow.id, failing.id}
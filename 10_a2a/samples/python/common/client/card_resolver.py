@@ -0,0 +1,187 @@
+import asyncio
+import json
+import logging
+import re
+import time
+import weakref
+
+from collections.abc import Iterable
+
+import httpx
+
+from pydantic import BaseModel
+
+from common.types import (
+    A2AClientJSONError,
+    AgentCard,
+)
+
+
+logger = logging.getLogger(__name__)
+
+MAX_AGE_PATTERN = re.compile(r'max-age=(\d+)')
+
+
+class CachedAgentCard(BaseModel):
+    card: AgentCard
+    etag: str | None
+    fetched_at: float
+    max_age: float
+    # no-cache or must-revalidate: never served stale.
+    must_revalidate: bool = False
+
+
+# Shared by all resolvers so every caller in the process benefits.
+_card_cache: dict[str, CachedAgentCard] = {}
+# Event loop -> card URL -> fetch in progress. Tasks belong to one loop.
+_inflight: weakref.WeakKeyDictionary[
+    asyncio.AbstractEventLoop, dict[str, asyncio.Task]
+] = weakref.WeakKeyDictionary()
+
+
+class A2ACardResolver:
+    """Resolves and caches the agent card published by an A2A server.
+
+    Cards are cached per URL for ``ttl`` seconds, or for the ``max-age``
+    the server sends in Cache-Control. Expired cards are revalidated with
+    If-None-Match, so an unchanged card costs a 304 without a body. For up
+    to ``stale_while_revalidate`` seconds after expiry,
+    ``get_agent_card_async`` returns the stale card immediately and
+    refreshes it in the background, unless the server sent no-cache or
+    must-revalidate. Cards sent with no-store are not cached.
+    """
+
+    def __init__(
+        self,
+        base_url,
+        agent_card_path='/.well-known/agent.json',
+        ttl: float = 300.0,
+        stale_while_revalidate: float = 3600.0,
+        httpx_client: httpx.AsyncClient | None = None,
+    ):
+        self.base_url = base_url.rstrip('/')
+        self.agent_card_path = agent_card_path.lstrip('/')
+        self.ttl = ttl
+        self.stale_while_revalidate = stale_while_revalidate
+        self.httpx_client = httpx_client
+
+    @property
+    def card_url(self) -> str:
+        return self.base_url + '/' + self.agent_card_path
+
+    def get_agent_card(self) -> AgentCard:
+        cached = _card_cache.get(self.card_url)
+        if cached is not None and self._age(cached) < cached.max_age:
+            return cached.card
+
+        with httpx.Client() as client:
+            response = client.get(
+                self.card_url, headers=self._conditional_headers(cached)
+            )
+        return self._store(response, cached)
+
+    async def get_agent_card_async(self) -> AgentCard:
+        cached = _card_cache.get(self.card_url)
+        if cached is not None:
+            age = self._age(cached)
+            if age < cached.max_age:
+                return cached.card
+            if (
+                not cached.must_revalidate
+                and age < cached.max_age + self.stale_while_revalidate
+            ):
+                self._revalidate()
+                return cached.card
+
+        return await self._revalidate()
+
+    @classmethod
+    async def prefetch(
+        cls, base_urls: Iterable[str], **kwargs
+    ) -> dict[str, AgentCard | Exception]:
+        """Resolves the cards of many agents concurrently.
+
+        Returns the card, or the error raised while fetching it, per URL.
+        """
+        base_urls = list(base_urls)
+        results = await asyncio.gather(
+            *(cls(url, **kwargs).get_agent_card_async() for url in base_urls),
+            return_exceptions=True,
+        )
+        return dict(zip(base_urls, results, strict=True))
+
+    def _revalidate(self) -> asyncio.Task:
+        # Concurrent lookups of the same card share one request.
+        inflight = _inflight.setdefault(asyncio.get_running_loop(), {})
+        task = inflight.get(self.card_url)
+        if task is None:
+            task = asyncio.create_task(self._fetch())
+            inflight[self.card_url] = task
+            task.add_done_callback(self._on_fetched)
+        return task
+
+    def _on_fetched(self, task: asyncio.Task):
+        _inflight.get(task.get_loop(), {}).pop(self.card_url, None)
+        if not task.cancelled() and task.exception() is not None:
+            logger.warning(
+                f'Error fetching agent card {self.card_url}: {task.exception()}'
+            )
+
+    async def _fetch(self) -> AgentCard:
+        cached = _card_cache.get(self.card_url)
+        headers = self._conditional_headers(cached)
+        if self.httpx_client is not None:
+            response = await self.httpx_client.get(
+                self.card_url, headers=headers
+            )
+        else:
+            async with httpx.AsyncClient() as client:
+                response = await client.get(self.card_url, headers=headers)
+        return self._store(response, cached)
+
+    def _store(
+        self, response: httpx.Response, cached: CachedAgentCard | None
+    ) -> AgentCard:
+        etag = response.headers.get('ETag')
+        if response.status_code == 304 and cached is not None:
+            card = cached.card
+            etag = etag or cached.etag
+        else:
+            response.raise_for_status()
+            try:
+                card = AgentCard(**response.json())
+            except json.JSONDecodeError as e:
+                raise A2AClientJSONError(str(e)) from e
+
+        cache_control = response.headers.get('Cache-Control', '')
+        if 'no-store' in cache_control:
+            _card_cache.pop(self.card_url, None)
+            return card
+
+        must_revalidate = (
+            'no-cache' in cache_control or 'must-revalidate' in cache_control
+        )
+        _card_cache[self.card_url] = CachedAgentCard(
+            card=card,
+            etag=etag,
+            fetched_at=time.monotonic(),
+            max_age=self._max_age(cache_control),
+            must_revalidate=must_revalidate,
+        )
+        return card
+
+    def _max_age(self, cache_control: str) -> float:
+        if 'no-cache' in cache_control:
+            return 0.0
+        match = MAX_AGE_PATTERN.search(cache_control)
+        return float(match.group(1)) if match else self.ttl
+
+    @staticmethod
+    def _conditional_headers(cached: CachedAgentCard | None) -> dict[str, str]:
+        if cached is None or cached.etag is None:
+            return {}
+        return {'If-None-Match': cached.etag}
+
+    @staticmethod
+    def _age(cached: CachedAgentCard) -> float:
+        return time.monotonic() - cached.fetched_at
@@ -0,0 +1,185 @@
+import json
+
+from collections.abc import AsyncIterable
+from typing import Any
+
+import httpx
+
+from httpx._types import TimeoutTypes
+from httpx_sse import aconnect_sse
+
+from common.types import (
+    A2AClientHTTPError,
+    A2AClientJSONError,
+    AgentCard,
+    CancelTaskRequest,
+    CancelTaskResponse,
+    GetTaskPushNotificationRequest,
+    GetTaskPushNotificationResponse,
+    GetTaskRequest,
+    GetTaskResponse,
+    JSONRPCRequest,
+    JSONRPCResponse,
+    SendTaskRequest,
+    SendTaskResponse,
+    SendTaskStreamingRequest,
+    SendTaskStreamingResponse,
+    SetTaskPushNotificationRequest,
+    SetTaskPushNotificationResponse,
+)
+
+
+RESPONSE_TYPES: dict[str, type[JSONRPCResponse]] = {
+    'tasks/get': GetTaskResponse,
+    'message/send': SendTaskResponse,
+    'tasks/cancel': CancelTaskResponse,
+    'tasks/pushNotification/set': SetTaskPushNotificationResponse,
+    'tasks/pushNotification/get': GetTaskPushNotificationResponse,
+}
+
+
+DEFAULT_LIMITS = httpx.Limits(
+    max_connections=100, max_keepalive_connections=20, keepalive_expiry=30.0
+)
+
+
+class A2AClient:
+    """JSON-RPC client for a single A2A agent.
+
+    Requests go through one pooled ``httpx.AsyncClient``, so connections to
+    the agent are kept alive and reused across calls. The pool is created
+    on first use and released by ``aclose()``, or by using the client as an
+    async context manager. A caller-provided ``httpx_client`` is shared and
+    left open. ``http2=True`` multiplexes calls over one connection and
+    needs the ``h2`` package (``httpx[http2]``).
+    """
+
+    def __init__(
+        self,
+        agent_card: AgentCard = None,
+        url: str = None,
+        timeout: TimeoutTypes = 60.0,
+        httpx_client: httpx.AsyncClient | None = None,
+        limits: httpx.Limits = DEFAULT_LIMITS,
+        http2: bool = False,
+    ):
+        if agent_card:
+            self.url = agent_card.url
+        elif url:
+            self.url = url
+        else:
+            raise ValueError('Must provide either agent_card or url')
+        self.timeout = timeout
+        self.limits = limits
+        self.http2 = http2
+        self._httpx_client = httpx_client
+        self._owns_httpx_client = httpx_client is None
+
+    async def __aenter__(self) -> 'A2AClient':
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.aclose()
+
+    async def aclose(self) -> None:
+        if self._owns_httpx_client and self._httpx_client is not None:
+            await self._httpx_client.aclose()
+            self._httpx_client = None
+
+    @property
+    def httpx_client(self) -> httpx.AsyncClient:
+        if self._httpx_client is None:
+            self._httpx_client = httpx.AsyncClient(
+                timeout=self.timeout, limits=self.limits, http2=self.http2
+            )
+        return self._httpx_client
+
+    async def send_task(self, payload: dict[str, Any]) -> SendTaskResponse:
+        request = SendTaskRequest(params=payload)
+        return SendTaskResponse(**await self._send_request(request))
+
+    async def send_task_streaming(
+        self, payload: dict[str, Any]
+    ) -> AsyncIterable[SendTaskStreamingResponse]:
+        request = SendTaskStreamingRequest(params=payload)
+        async with aconnect_sse(
+            self.httpx_client,
+            'POST',
+            self.url,
+            json=request.model_dump(),
+            timeout=None,
+        ) as event_source:
+            try:
+                async for sse in event_source.aiter_sse():
+                    yield SendTaskStreamingResponse(**json.loads(sse.data))
+            except json.JSONDecodeError as e:
+                raise A2AClientJSONError(str(e)) from e
+            except httpx.RequestError as e:
+                raise A2AClientHTTPError(400, str(e)) from e
+
+    async def batch(
+        self, requests: list[JSONRPCRequest]
+    ) -> list[JSONRPCResponse]:
+        """Sends several requests in a single JSON-RPC batch call.
+
+        The server runs the calls concurrently. Responses are returned in the
+        same order as ``requests``. Streaming methods cannot be batched.
+        """
+        if not requests:
+            return []
+
+        data = await self._post([request.model_dump() for request in requests])
+        if not isinstance(data, list):
+            raise A2AClientJSONError(f'Expected a batch response, got {data}')
+
+        responses_by_id = {item.get('id'): item for item in data}
+        responses = []
+        for request in requests:
+            item = responses_by_id.get(request.id)
+            if item is None:
+                raise A2AClientJSONError(
+                    f'Missing response for request {request.id}'
+                )
+            response_type = RESPONSE_TYPES.get(request.method, JSONRPCResponse)
+            responses.append(response_type(**item))
+        return responses
+
+    async def _send_request(self, request: JSONRPCRequest) -> dict[str, Any]:
+        return await self._post(request.model_dump())
+
+    async def _post(self, payload: Any) -> Any:
+        try:
+            # Image generation could take time, adding timeout
+            response = await self.httpx_client.post(
+                self.url, json=payload, timeout=self.timeout
+            )
+            response.raise_for_status()
+            return response.json()
+        except httpx.HTTPStatusError as e:
+            raise A2AClientHTTPError(e.response.status_code, str(e)) from e
+        except json.JSONDecodeError as e:
+            raise A2AClientJSONError(str(e)) from e
+
+    async def get_task(self, payload: dict[str, Any]) -> GetTaskResponse:
+        request = GetTaskRequest(params=payload)
+        return GetTaskResponse(**await self._send_request(request))
+
+    async def cancel_task(self, payload: dict[str, Any]) -> CancelTaskResponse:
+        request = CancelTaskRequest(params=payload)
+        return CancelTaskResponse(**await self._send_request(request))
+
+    async def set_task_callback(
+        self, payload: dict[str, Any]
+    ) -> SetTaskPushNotificationResponse:
+        request = SetTaskPushNotificationRequest(params=payload)
+        return SetTaskPushNotificationResponse(
+            **await self._send_request(request)
+        )
+
+    async def get_task_callback(
+        self, payload: dict[str, Any]
+    ) -> GetTaskPushNotificationResponse:
+        request = GetTaskPushNotificationRequest(params=payload)
+        return GetTaskPushNotificationResponse(
+            **await self._send_request(request)
+        )
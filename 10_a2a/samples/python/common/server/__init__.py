@@ -0,0 +1,22 @@
+from .event_queue import EventQueue, OverflowPolicy
+from .server import A2AServer
+from .task_manager import InMemoryTaskManager, TaskManager
+from .task_store import (
+    InMemoryTaskStore,
+    LogTaskStore,
+    SQLiteTaskStore,
+    TaskStore,
+)
+
+
+__all__ = [
+    'A2AServer',
+    'EventQueue',
+    'InMemoryTaskManager',
+    'InMemoryTaskStore',
+    'LogTaskStore',
+    'OverflowPolicy',
+    'SQLiteTaskStore',
+    'TaskManager',
+    'TaskStore',
+]
@@ -0,0 +1,154 @@
+import asyncio
+
+from collections import deque
+from collections.abc import Iterator
+from enum import Enum
+from itertools import count
+from typing import Any
+
+from common.types import InternalError, TaskStatusUpdateEvent
+
+
+class OverflowPolicy(str, Enum):
+    DROP_OLDEST = 'drop_oldest'
+    COALESCE = 'coalesce'
+    DISCONNECT = 'disconnect'
+
+
+class EventJournal:
+    """Bounded, replayable log of the events published for one task.
+
+    Every event gets a sequence number that increases with every event.
+    The number is sent to SSE clients as the event id, so a reconnecting
+    client can resume after the last event it saw. Journals that share
+    ``ids`` draw from one sequence, so a journal recreated for the same
+    task never reuses an id a client may already have seen.
+    """
+
+    def __init__(self, maxsize: int = 256, ids: Iterator[int] | None = None):
+        self._events: deque[tuple[int, Any]] = deque(maxlen=maxsize)
+        self._ids = ids if ids is not None else count(1)
+
+    def append(self, event: Any) -> int:
+        event_id = next(self._ids)
+        self._events.append((event_id, event))
+        return event_id
+
+    def since(self, last_event_id: int | None) -> list[tuple[int, Any]]:
+        """Return the retained events newer than ``last_event_id``."""
+        if last_event_id is None:
+            return list(self._events)
+        return [
+            (event_id, event)
+            for event_id, event in self._events
+            if event_id > last_event_id
+        ]
+
+
+class EventQueue:
+    """Bounded, non-blocking event buffer for a single SSE subscriber.
+
+    ``put_nowait`` never waits, so one slow client cannot stall fan-out to
+    the others. When the buffer is full the overflow policy decides what
+    happens:
+
+    - DROP_OLDEST discards the oldest buffered event.
+    - COALESCE replaces the newest buffered non-final status update with
+      the incoming one, and falls back to DROP_OLDEST otherwise.
+    - DISCONNECT discards the buffer and ends the stream with an error.
+
+    Final status updates are never dropped or coalesced away.
+    """
+
+    def __init__(
+        self,
+        maxsize: int = 256,
+        policy: OverflowPolicy = OverflowPolicy.DROP_OLDEST,
+        stats: dict[str, int] | None = None,
+    ):
+        self.maxsize = maxsize
+        self.policy = policy
+        self.stats = stats if stats is not None else {}
+        self.dropped = 0
+        self.coalesced = 0
+        self.closed = False
+        self._events: deque[tuple[int | None, Any]] = deque()
+        self._ready = asyncio.Event()
+
+    def qsize(self) -> int:
+        return len(self._events)
+
+    def put_nowait(self, event: Any, event_id: int | None = None) -> None:
+        if self.closed:
+            return
+        if len(self._events) >= self.maxsize:
+            if self.policy == OverflowPolicy.DISCONNECT:
+                self._disconnect((event_id, event))
+                return
+            if not (
+                self.policy == OverflowPolicy.COALESCE
+                and _is_transient_status(event)
+                and self._coalesce(event, event_id)
+            ):
+                self._drop_oldest()
+                self._events.append((event_id, event))
+        else:
+            self._events.append((event_id, event))
+        self._ready.set()
+
+    async def get(self) -> tuple[int | None, Any]:
+        while not self._events:
+            self._ready.clear()
+            await self._ready.wait()
+        return self._events.popleft()
+
+    def _coalesce(
+        self, event: TaskStatusUpdateEvent, event_id: int | None
+    ) -> bool:
+        for i in range(len(self._events) - 1, -1, -1):
+            if _is_transient_status(self._events[i][1]):
+                del self._events[i]
+                self._events.append((event_id, event))
+                self.coalesced += 1
+                self._count('coalesced')
+                return True
+        return False
+
+    def _drop_oldest(self):
+        for i, (_, queued) in enumerate(self._events):
+            if not _is_final_status(queued):
+                del self._events[i]
+                self.dropped += 1
+                self._count('dropped')
+                return
+
+    def _disconnect(self, incoming: tuple[int | None, Any]):
+        # Final status updates are kept, ahead of the error, so the client
+        # still learns how the task ended.
+        events = [*self._events, incoming]
+        final = [item for item in events if _is_final_status(item[1])]
+        dropped = len(events) - len(final)
+        self.dropped += dropped
+        self._count('dropped', dropped)
+        self._count('disconnected')
+        self._events.clear()
+        self._events.extend(final)
+        self._events.append(
+            (
+                None,
+                InternalError(message='Subscriber is too slow, disconnecting'),
+            )
+        )
+        self.closed = True
+        self._ready.set()
+
+    def _count(self, key: str, amount: int = 1):
+        self.stats[key] = self.stats.get(key, 0) + amount
+
+
+def _is_final_status(event: Any) -> bool:
+    return isinstance(event, TaskStatusUpdateEvent) and event.final
+
+
+def _is_transient_status(event: Any) -> bool:
+    return isinstance(event, TaskStatusUpdateEvent) and not event.final
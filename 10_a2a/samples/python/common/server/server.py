@@ -0,0 +1,241 @@
+import asyncio
+import hashlib
+import json
+import logging
+
+from collections.abc import AsyncIterable
+from typing import Any
+
+from pydantic import ValidationError
+from sse_starlette.sse import EventSourceResponse
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import Response
+
+from common.server.task_manager import TaskManager
+from common.types import (
+    A2ARequest,
+    AgentCard,
+    InternalError,
+    InvalidRequestError,
+    JSONParseError,
+    JSONRPCError,
+    JSONRPCResponse,
+    TaskResubscriptionRequest,
+)
+
+
+logger = logging.getLogger(__name__)
+
+# JSON-RPC method name -> TaskManager method that handles it.
+METHOD_HANDLERS = {
+    'tasks/get': 'on_get_task',
+    'message/send': 'on_send_task',
+    'message/stream': 'on_send_task_subscribe',
+    'tasks/cancel': 'on_cancel_task',
+    'tasks/pushNotification/set': 'on_set_task_push_notification',
+    'tasks/pushNotification/get': 'on_get_task_push_notification',
+    'tasks/resubscribe': 'on_resubscribe_to_task',
+}
+
+STREAMING_METHODS = {'message/stream', 'tasks/resubscribe'}
+
+
+def _is_json_error(e: Exception) -> bool:
+    return isinstance(e, ValidationError) and any(
+        error['type'] == 'json_invalid' for error in e.errors()
+    )
+
+
+class A2AServer:
+    def __init__(
+        self,
+        host='0.0.0.0',
+        port=5000,
+        endpoint='/',
+        agent_card: AgentCard = None,
+        task_manager: TaskManager = None,
+        agent_card_max_age: int = 300,
+    ):
+        self.host = host
+        self.port = port
+        self.endpoint = endpoint
+        self.task_manager = task_manager
+        self.agent_card_max_age = agent_card_max_age
+        self.agent_card = agent_card
+        self.app = Starlette()
+        self.app.add_route(
+            self.endpoint, self._process_request, methods=['POST']
+        )
+        self.app.add_route(
+            '/.well-known/agent.json', self._get_agent_card, methods=['GET']
+        )
+
+    def start(self):
+        if self.agent_card is None:
+            raise ValueError('agent_card is not defined')
+
+        if self.task_manager is None:
+            raise ValueError('request_handler is not defined')
+
+        import uvicorn
+
+        uvicorn.run(self.app, host=self.host, port=self.port)
+
+    @property
+    def agent_card(self) -> AgentCard:
+        return self._agent_card
+
+    @agent_card.setter
+    def agent_card(self, agent_card: AgentCard):
+        # Assign a new card to publish changes, the cached bytes and ETag
+        # are only recomputed here.
+        self._agent_card = agent_card
+        self._agent_card_body = None
+        self._agent_card_etag = None
+
+    def _get_agent_card(self, request: Request) -> Response:
+        if self._agent_card_body is None:
+            self._agent_card_body = self.agent_card.model_dump_json(
+                exclude_none=True
+            ).encode()
+            digest = hashlib.sha256(self._agent_card_body).hexdigest()
+            self._agent_card_etag = f'"{digest}"'
+
+        headers = {
+            'ETag': self._agent_card_etag,
+            'Cache-Control': f'public, max-age={self.agent_card_max_age}',
+        }
+        if_none_match = request.headers.get('If-None-Match', '')
+        if self._agent_card_etag in if_none_match or if_none_match == '*':
+            return Response(status_code=304, headers=headers)
+        return Response(
+            self._agent_card_body,
+            media_type='application/json',
+            headers=headers,
+        )
+
+    async def _process_request(self, request: Request):
+        try:
+            body = await request.body()
+            if body.lstrip()[:1] == b'[':
+                return await self._process_batch(request, json.loads(body))
+
+            json_rpc_request = A2ARequest.validate_json(body)
+            result = await self._dispatch(request, json_rpc_request)
+            return self._create_response(result)
+
+        except Exception as e:
+            return self._handle_exception(e)
+
+    async def _dispatch(self, request: Request, json_rpc_request) -> Any:
+        handler_name = METHOD_HANDLERS.get(json_rpc_request.method)
+        if handler_name is None:
+            logger.warning(f'Unexpected request type: {type(json_rpc_request)}')
+            raise ValueError(
+                f'Unexpected request type: {type(json_rpc_request)}'
+            )
+
+        if isinstance(json_rpc_request, TaskResubscriptionRequest):
+            self._apply_last_event_id(request, json_rpc_request)
+        handler = getattr(self.task_manager, handler_name)
+        return await handler(json_rpc_request)
+
+    async def _process_batch(self, request: Request, items: list) -> Response:
+        if not items:
+            response = JSONRPCResponse(
+                id=None,
+                error=InvalidRequestError(message='Batch request is empty'),
+            )
+            return Response(
+                response.model_dump_json(exclude_none=True),
+                status_code=400,
+                media_type='application/json',
+            )
+
+        # Batched calls are independent, run them concurrently.
+        responses = await asyncio.gather(
+            *(self._process_batch_item(request, item) for item in items)
+        )
+        return Response(
+            f'[{",".join(responses)}]', media_type='application/json'
+        )
+
+    async def _process_batch_item(self, request: Request, item: Any) -> str:
+        request_id = item.get('id') if isinstance(item, dict) else None
+        try:
+            json_rpc_request = A2ARequest.validate_python(item)
+            if json_rpc_request.method in STREAMING_METHODS:
+                return self._serialize_response(
+                    JSONRPCResponse(
+                        id=request_id,
+                        error=InvalidRequestError(
+                            message='Streaming methods cannot be batched'
+                        ),
+                    )
+                )
+            result = await self._dispatch(request, json_rpc_request)
+            if not isinstance(result, JSONRPCResponse):
+                raise ValueError(f'Unexpected result type: {type(result)}')
+        except Exception as e:
+            result = JSONRPCResponse(
+                id=request_id, error=self._to_json_rpc_error(e)
+            )
+        return self._serialize_response(result)
+
+    def _apply_last_event_id(
+        self, request: Request, json_rpc_request: TaskResubscriptionRequest
+    ):
+        # EventSource clients send the id of the last event they received
+        # when reconnecting, resume from there unless the params say otherwise.
+        last_event_id = request.headers.get('Last-Event-ID')
+        if last_event_id:
+            metadata = json_rpc_request.params.metadata or {}
+            metadata.setdefault('lastEventId', last_event_id)
+            json_rpc_request.params.metadata = metadata
+
+    def _to_json_rpc_error(self, e: Exception) -> JSONRPCError:
+        if isinstance(e, json.decoder.JSONDecodeError) or _is_json_error(e):
+            return JSONParseError()
+        if isinstance(e, ValidationError):
+            return InvalidRequestError(data=json.loads(e.json()))
+        logger.error(f'Unhandled exception: {e}')
+        return InternalError()
+
+    def _handle_exception(self, e: Exception) -> Response:
+        response = JSONRPCResponse(id=None, error=self._to_json_rpc_error(e))
+        return Response(
+            response.model_dump_json(exclude_none=True),
+            status_code=400,
+            media_type='application/json',
+        )
+
+    def _create_response(
+        self, result: Any
+    ) -> Response | EventSourceResponse:
+        if isinstance(result, AsyncIterable):
+
+            async def event_generator(result) -> AsyncIterable[dict[str, str]]:
+                async for item in result:
+                    event = {'data': item.model_dump_json(exclude_none=True)}
+                    event_id = getattr(item, '_event_id', None)
+                    if event_id is not None:
+                        event['id'] = str(event_id)
+                    yield event
+
+            return EventSourceResponse(event_generator(result))
+        if isinstance(result, JSONRPCResponse):
+            return Response(
+                self._serialize_response(result),
+                media_type='application/json',
+            )
+        logger.error(f'Unexpected result type: {type(result)}')
+        raise ValueError(f'Unexpected result type: {type(result)}')
+
+    def _serialize_response(self, result: JSONRPCResponse) -> str:
+        result_json = getattr(result, '_result_json', None)
+        if result_json is None:
+            return result.model_dump_json(exclude_none=True)
+
+        envelope = result.model_dump_json(exclude_none=True, exclude={'result'})
+        return f'{envelope[:-1]},"result":{result_json}}}'
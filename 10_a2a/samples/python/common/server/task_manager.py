@@ -0,0 +1,479 @@
+import asyncio
+import logging
+
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from collections.abc import AsyncIterable
+from itertools import count
+from typing import Any
+
+from common.server.event_queue import (
+    EventJournal,
+    EventQueue,
+    OverflowPolicy,
+)
+from common.server.task_store import InMemoryTaskStore, TaskStore
+from common.types import (
+    Artifact,
+    CancelTaskRequest,
+    CancelTaskResponse,
+    GetTaskPushNotificationRequest,
+    GetTaskPushNotificationResponse,
+    GetTaskRequest,
+    GetTaskResponse,
+    InternalError,
+    InvalidParamsError,
+    JSONRPCError,
+    JSONRPCResponse,
+    PushNotificationConfig,
+    SendTaskRequest,
+    SendTaskResponse,
+    SendTaskStreamingRequest,
+    SendTaskStreamingResponse,
+    SetTaskPushNotificationRequest,
+    SetTaskPushNotificationResponse,
+    Task,
+    TaskIdParams,
+    TaskNotCancelableError,
+    TaskNotFoundError,
+    TaskPushNotificationConfig,
+    TaskQueryParams,
+    TaskResubscriptionRequest,
+    TaskSendParams,
+    TaskState,
+    TaskStatus,
+    TaskStatusUpdateEvent,
+)
+
+
+logger = logging.getLogger(__name__)
+
+TERMINAL_STATES = (TaskState.COMPLETED, TaskState.CANCELED, TaskState.FAILED)
+
+
+class TaskManager(ABC):
+    @abstractmethod
+    async def on_get_task(self, request: GetTaskRequest) -> GetTaskResponse:
+        pass
+
+    @abstractmethod
+    async def on_cancel_task(
+        self, request: CancelTaskRequest
+    ) -> CancelTaskResponse:
+        pass
+
+    @abstractmethod
+    async def on_send_task(self, request: SendTaskRequest) -> SendTaskResponse:
+        pass
+
+    @abstractmethod
+    async def on_send_task_subscribe(
+        self, request: SendTaskStreamingRequest
+    ) -> AsyncIterable[SendTaskStreamingResponse] | JSONRPCResponse:
+        pass
+
+    @abstractmethod
+    async def on_set_task_push_notification(
+        self, request: SetTaskPushNotificationRequest
+    ) -> SetTaskPushNotificationResponse:
+        pass
+
+    @abstractmethod
+    async def on_get_task_push_notification(
+        self, request: GetTaskPushNotificationRequest
+    ) -> GetTaskPushNotificationResponse:
+        pass
+
+    @abstractmethod
+    async def on_resubscribe_to_task(
+        self, request: TaskResubscriptionRequest
+    ) -> AsyncIterable[SendTaskResponse] | JSONRPCResponse:
+        pass
+
+
+class InMemoryTaskManager(TaskManager):
+    # historyLength values with a cached tasks/get result, per task.
+    TASK_JSON_VARIANTS = 4
+
+    def __init__(
+        self,
+        task_store: TaskStore | None = None,
+        lock_stripes: int = 64,
+        sse_queue_size: int = 256,
+        sse_overflow_policy: OverflowPolicy = OverflowPolicy.DROP_OLDEST,
+        journal_size: int = 256,
+        max_journals: int = 1024,
+        task_json_cache_size: int = 1024,
+        task_json_cache_bytes: int = 16 * 1024 * 1024,
+    ):
+        self.task_store = task_store or InMemoryTaskStore()
+        self.push_notification_infos: dict[str, PushNotificationConfig] = {}
+        # Requests for different tasks take different locks, so unrelated
+        # tasks do not queue up behind each other.
+        self.task_locks = [asyncio.Lock() for _ in range(lock_stripes)]
+        self.task_sse_subscribers: dict[str, list[EventQueue]] = {}
+        self.subscriber_lock = asyncio.Lock()
+        self.sse_queue_size = sse_queue_size
+        self.sse_overflow_policy = sse_overflow_policy
+        self.sse_stats = {'dropped': 0, 'coalesced': 0, 'disconnected': 0}
+        # Recent events per task, replayed on tasks/resubscribe. Only the
+        # journals of the max_journals most recently active tasks are kept.
+        self.task_event_journals: OrderedDict[str, EventJournal] = (
+            OrderedDict()
+        )
+        self.journal_size = journal_size
+        self.max_journals = max_journals
+        # Event ids of all journals, so ids keep increasing when the journal
+        # of a task is evicted and recreated.
+        self.event_ids = count(1)
+        # Serialized tasks/get results by task id and historyLength, reused
+        # while the task is unchanged so polling clients do not re-serialize
+        # long histories. Bounded by task count and total size.
+        self.task_json_cache: OrderedDict[
+            str, dict[int | None, tuple[tuple, str]]
+        ] = OrderedDict()
+        self.task_json_cache_size = task_json_cache_size
+        self.task_json_cache_bytes = task_json_cache_bytes
+        self._task_json_bytes = 0
+
+    def get_task_lock(self, task_id: str) -> asyncio.Lock:
+        return self.task_locks[hash(task_id) % len(self.task_locks)]
+
+    async def on_get_task(self, request: GetTaskRequest) -> GetTaskResponse:
+        logger.info(f'Getting task {request.params.id}')
+        task_query_params: TaskQueryParams = request.params
+
+        async with self.get_task_lock(task_query_params.id):
+            task = await self.task_store.get(task_query_params.id)
+            if task is None:
+                return GetTaskResponse(id=request.id, error=TaskNotFoundError())
+
+            task_result = self.append_task_history(
+                task, task_query_params.historyLength
+            )
+            task_json = self.serialize_task_result(
+                task, task_result, task_query_params.historyLength
+            )
+
+        response = GetTaskResponse(id=request.id, result=task_result)
+        response._result_json = task_json
+        return response
+
+    async def on_cancel_task(
+        self, request: CancelTaskRequest
+    ) -> CancelTaskResponse:
+        logger.info(f'Cancelling task {request.params.id}')
+        task_id_params: TaskIdParams = request.params
+
+        async with self.get_task_lock(task_id_params.id):
+            task = await self.task_store.get(task_id_params.id)
+            if task is None:
+                return CancelTaskResponse(
+                    id=request.id, error=TaskNotFoundError()
+                )
+
+        return CancelTaskResponse(id=request.id, error=TaskNotCancelableError())
+
+    @abstractmethod
+    async def on_send_task(self, request: SendTaskRequest) -> SendTaskResponse:
+        pass
+
+    @abstractmethod
+    async def on_send_task_subscribe(
+        self, request: SendTaskStreamingRequest
+    ) -> AsyncIterable[SendTaskStreamingResponse] | JSONRPCResponse:
+        pass
+
+    async def set_push_notification_info(
+        self, task_id: str, notification_config: PushNotificationConfig
+    ):
+        async with self.get_task_lock(task_id):
+            task = await self.task_store.get(task_id)
+            if task is None:
+                raise ValueError(f'Task not found for {task_id}')
+
+            self.push_notification_infos[task_id] = notification_config
+
+    async def get_push_notification_info(
+        self, task_id: str
+    ) -> PushNotificationConfig:
+        async with self.get_task_lock(task_id):
+            task = await self.task_store.get(task_id)
+            if task is None:
+                raise ValueError(f'Task not found for {task_id}')
+
+            return self.push_notification_infos[task_id]
+
+    async def has_push_notification_info(self, task_id: str) -> bool:
+        return task_id in self.push_notification_infos
+
+    async def on_set_task_push_notification(
+        self, request: SetTaskPushNotificationRequest
+    ) -> SetTaskPushNotificationResponse:
+        logger.info(f'Setting task push notification {request.params.id}')
+        task_notification_params: TaskPushNotificationConfig = request.params
+
+        try:
+            await self.set_push_notification_info(
+                task_notification_params.id,
+                task_notification_params.pushNotificationConfig,
+            )
+        except Exception as e:
+            logger.error(f'Error while setting push notification info: {e}')
+            return JSONRPCResponse(
+                id=request.id,
+                error=InternalError(
+                    message='An error occurred while setting push notification info'
+                ),
+            )
+
+        return SetTaskPushNotificationResponse(
+            id=request.id, result=task_notification_params
+        )
+
+    async def on_get_task_push_notification(
+        self, request: GetTaskPushNotificationRequest
+    ) -> GetTaskPushNotificationResponse:
+        logger.info(f'Getting task push notification {request.params.id}')
+        task_params: TaskIdParams = request.params
+
+        try:
+            notification_info = await self.get_push_notification_info(
+                task_params.id
+            )
+        except Exception as e:
+            logger.error(f'Error while getting push notification info: {e}')
+            return GetTaskPushNotificationResponse(
+                id=request.id,
+                error=InternalError(
+                    message='An error occurred while getting push notification info'
+                ),
+            )
+
+        return GetTaskPushNotificationResponse(
+            id=request.id,
+            result=TaskPushNotificationConfig(
+                id=task_params.id, pushNotificationConfig=notification_info
+            ),
+        )
+
+    async def upsert_task(self, task_send_params: TaskSendParams) -> Task:
+        logger.info(f'Upserting task {task_send_params.id}')
+        async with self.get_task_lock(task_send_params.id):
+            task = await self.task_store.get(task_send_params.id)
+            if task is None:
+                task = Task(
+                    id=task_send_params.id,
+                    sessionId=task_send_params.sessionId,
+                    messages=[task_send_params.message],
+                    status=TaskStatus(state=TaskState.SUBMITTED),
+                    history=[task_send_params.message],
+                )
+            else:
+                task.history.append(task_send_params.message)
+
+            self.drop_task_json(task.id)
+            await self.task_store.save(task)
+            return task
+
+    async def on_resubscribe_to_task(
+        self, request: TaskResubscriptionRequest
+    ) -> AsyncIterable[SendTaskStreamingResponse] | JSONRPCResponse:
+        task_id_params: TaskIdParams = request.params
+        logger.info(f'Resubscribing to task {task_id_params.id}')
+
+        try:
+            last_event_id = (task_id_params.metadata or {}).get('lastEventId')
+            last_event_id = int(last_event_id) if last_event_id else None
+        except ValueError:
+            return JSONRPCResponse(
+                id=request.id,
+                error=InvalidParamsError(message='Invalid lastEventId'),
+            )
+
+        async with self.get_task_lock(task_id_params.id):
+            task = await self.task_store.get(task_id_params.id)
+        if task is None:
+            return JSONRPCResponse(id=request.id, error=TaskNotFoundError())
+
+        sse_event_queue = await self.setup_sse_consumer(task_id_params.id)
+        # Taken right after subscribing, with no await in between, so no
+        # event can fall between the replay and the live queue.
+        journal = self.task_event_journals.get(task_id_params.id)
+        replay = journal.since(last_event_id) if journal else []
+        if not replay and task.status.state in TERMINAL_STATES:
+            replay = [
+                (
+                    None,
+                    TaskStatusUpdateEvent(
+                        id=task.id, status=task.status, final=True
+                    ),
+                )
+            ]
+
+        return self.dequeue_events_for_sse(
+            request.id, task_id_params.id, sse_event_queue, replay
+        )
+
+    async def update_store(
+        self, task_id: str, status: TaskStatus, artifacts: list[Artifact]
+    ) -> Task:
+        async with self.get_task_lock(task_id):
+            task = await self.task_store.get(task_id)
+            if task is None:
+                logger.error(f'Task {task_id} not found for updating the task')
+                raise ValueError(f'Task {task_id} not found')
+
+            task.status = status
+
+            if status.message is not None:
+                task.history.append(status.message)
+
+            if artifacts is not None:
+                if task.artifacts is None:
+                    task.artifacts = []
+                task.artifacts.extend(artifacts)
+
+            self.drop_task_json(task.id)
+            await self.task_store.save(task)
+            return task
+
+    def append_task_history(self, task: Task, historyLength: int | None):
+        # Shallow copy, the window shares Message objects with the task.
+        if historyLength is not None and historyLength > 0 and task.history:
+            history = task.history[-historyLength:]
+        else:
+            history = []
+
+        return task.model_copy(update={'history': history})
+
+    def serialize_task_result(
+        self, task: Task, task_result: Task, historyLength: int | None
+    ) -> str:
+        # Any change made through upsert_task/update_store drops the entry,
+        # the fingerprint also catches tasks mutated directly by subclasses.
+        fingerprint = (
+            len(task.history or ()),
+            len(task.artifacts or ()),
+            task.status.state,
+            task.status.timestamp,
+        )
+        variants = self.task_json_cache.get(task.id)
+        cached = variants.get(historyLength) if variants else None
+        if cached is not None and cached[0] == fingerprint:
+            self.task_json_cache.move_to_end(task.id)
+            return cached[1]
+
+        task_json = task_result.model_dump_json(exclude_none=True)
+        if variants is None:
+            variants = self.task_json_cache[task.id] = {}
+        elif cached is not None:
+            del variants[historyLength]
+            self._task_json_bytes -= len(cached[1])
+        elif len(variants) >= self.TASK_JSON_VARIANTS:
+            # Keep a few historyLength values per task, oldest out.
+            oldest = next(iter(variants))
+            self._task_json_bytes -= len(variants.pop(oldest)[1])
+        if len(task_json) > self.task_json_cache_bytes:
+            if not variants:
+                del self.task_json_cache[task.id]
+            return task_json
+        variants[historyLength] = (fingerprint, task_json)
+        self._task_json_bytes += len(task_json)
+        self.task_json_cache.move_to_end(task.id)
+        while self.task_json_cache and (
+            len(self.task_json_cache) > self.task_json_cache_size
+            or self._task_json_bytes > self.task_json_cache_bytes
+        ):
+            self.drop_task_json(next(iter(self.task_json_cache)))
+        return task_json
+
+    def drop_task_json(self, task_id: str) -> None:
+        variants = self.task_json_cache.pop(task_id, None)
+        if variants:
+            self._task_json_bytes -= sum(
+                len(task_json) for _, task_json in variants.values()
+            )
+
+    async def setup_sse_consumer(
+        self, task_id: str, is_resubscribe: bool = False
+    ):
+        async with self.subscriber_lock:
+            if task_id not in self.task_sse_subscribers:
+                if is_resubscribe:
+                    raise ValueError('Task not found for resubscription')
+                self.task_sse_subscribers[task_id] = []
+
+            sse_event_queue = EventQueue(
+                maxsize=self.sse_queue_size,
+                policy=self.sse_overflow_policy,
+                stats=self.sse_stats,
+            )
+            self.task_sse_subscribers[task_id].append(sse_event_queue)
+            return sse_event_queue
+
+    async def enqueue_events_for_sse(self, task_id, task_update_event):
+        event_id = self.record_event(task_id, task_update_event)
+
+        async with self.subscriber_lock:
+            if task_id not in self.task_sse_subscribers:
+                return
+
+            current_subscribers = list(self.task_sse_subscribers[task_id])
+
+        for subscriber in current_subscribers:
+            subscriber.put_nowait(task_update_event, event_id)
+
+    def record_event(self, task_id: str, task_update_event) -> int | None:
+        if isinstance(task_update_event, JSONRPCError):
+            return None
+
+        journal = self.task_event_journals.get(task_id)
+        if journal is None:
+            journal = EventJournal(self.journal_size, self.event_ids)
+            self.task_event_journals[task_id] = journal
+            if len(self.task_event_journals) > self.max_journals:
+                self.task_event_journals.popitem(last=False)
+        else:
+            self.task_event_journals.move_to_end(task_id)
+
+        return journal.append(task_update_event)
+
+    async def dequeue_events_for_sse(
+        self,
+        request_id,
+        task_id,
+        sse_event_queue: EventQueue,
+        replay: list[tuple[int | None, Any]] | None = None,
+    ) -> AsyncIterable[SendTaskStreamingResponse] | JSONRPCResponse:
+        last_event_id = 0
+        try:
+            for event_id, event in replay or []:
+                yield self._new_sse_response(request_id, event_id, event)
+                last_event_id = event_id or last_event_id
+                if isinstance(event, TaskStatusUpdateEvent) and event.final:
+                    return
+
+            while True:
+                event_id, event = await sse_event_queue.get()
+                if isinstance(event, JSONRPCError):
+                    yield SendTaskStreamingResponse(id=request_id, error=event)
+                    break
+                if event_id is not None and event_id <= last_event_id:
+                    # Already sent as part of the replay.
+                    continue
+
+                yield self._new_sse_response(request_id, event_id, event)
+                if isinstance(event, TaskStatusUpdateEvent) and event.final:
+                    break
+        finally:
+            async with self.subscriber_lock:
+                if task_id in self.task_sse_subscribers:
+                    self.task_sse_subscribers[task_id].remove(sse_event_queue)
+
+    def _new_sse_response(
+        self, request_id, event_id: int | None, event
+    ) -> SendTaskStreamingResponse:
+        response = SendTaskStreamingResponse(id=request_id, result=event)
+        response._event_id = event_id
+        return response
@@ -0,0 +1,354 @@
+import asyncio
+import logging
+import os
+import sqlite3
+import struct
+import threading
+
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from pathlib import Path
+
+from common.types import Task
+
+
+logger = logging.getLogger(__name__)
+
+
+class TaskStore(ABC):
+    """Storage backend used by InMemoryTaskManager to keep task state."""
+
+    @abstractmethod
+    async def get(self, task_id: str) -> Task | None:
+        pass
+
+    @abstractmethod
+    async def save(self, task: Task) -> None:
+        pass
+
+    async def flush(self) -> None:
+        """Persist any buffered writes."""
+
+    async def close(self) -> None:
+        await self.flush()
+
+
+class InMemoryTaskStore(TaskStore):
+    """Keeps every task in a dict for the lifetime of the process."""
+
+    def __init__(self):
+        self.tasks: dict[str, Task] = {}
+
+    async def get(self, task_id: str) -> Task | None:
+        return self.tasks.get(task_id)
+
+    async def save(self, task: Task) -> None:
+        self.tasks[task.id] = task
+
+
+class CachedTaskStore(TaskStore):
+    """Base class for durable stores with an LRU hot-set and batched writes.
+
+    Recently used tasks are kept in memory, up to ``cache_size`` entries.
+    Saved tasks are marked dirty and written to the backing engine in a
+    single batch once ``batch_size`` tasks are pending or ``flush_interval``
+    seconds have passed. Dirty tasks are never evicted before they are
+    written. Engine I/O runs in a worker thread so it does not block the
+    event loop.
+    """
+
+    def __init__(
+        self,
+        cache_size: int = 1024,
+        batch_size: int = 64,
+        flush_interval: float = 0.05,
+    ):
+        self.cache_size = cache_size
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._hot: OrderedDict[str, Task] = OrderedDict()
+        self._dirty: dict[str, Task] = {}
+        self._flushing: dict[str, Task] = {}
+        self._flush_lock = asyncio.Lock()
+        self._flush_task: asyncio.Task | None = None
+
+    @abstractmethod
+    def _read(self, task_id: str) -> str | None:
+        """Return the serialized task, or None if it is not stored."""
+
+    @abstractmethod
+    def _write_batch(self, records: list[tuple[str, str]]) -> None:
+        """Durably write ``(task_id, serialized_task)`` records."""
+
+    def _close_engine(self) -> None:
+        pass
+
+    async def get(self, task_id: str) -> Task | None:
+        task = self._hot.get(task_id)
+        if task is not None:
+            self._hot.move_to_end(task_id)
+            return task
+
+        data = await asyncio.to_thread(self._read, task_id)
+        if data is None:
+            return None
+
+        task = self._hot.get(task_id)
+        if task is None:
+            task = Task.model_validate_json(data)
+            self._remember(task)
+        return task
+
+    async def save(self, task: Task) -> None:
+        self._dirty[task.id] = task
+        self._remember(task)
+        if len(self._dirty) >= self.batch_size:
+            await self.flush()
+        elif self._flush_task is None or self._flush_task.done():
+            self._flush_task = asyncio.create_task(self._delayed_flush())
+
+    async def flush(self) -> None:
+        async with self._flush_lock:
+            if not self._dirty:
+                return
+            self._flushing, self._dirty = self._dirty, {}
+            records = [
+                (task_id, task.model_dump_json(exclude_none=True))
+                for task_id, task in self._flushing.items()
+            ]
+            try:
+                await asyncio.to_thread(self._write_batch, records)
+            except Exception:
+                # Put the batch back unless a newer version is pending.
+                for task_id, task in self._flushing.items():
+                    self._dirty.setdefault(task_id, task)
+                raise
+            finally:
+                self._flushing = {}
+            self._evict()
+
+    async def close(self) -> None:
+        if self._flush_task is not None and not self._flush_task.done():
+            self._flush_task.cancel()
+        await self.flush()
+        await asyncio.to_thread(self._close_engine)
+
+    async def _delayed_flush(self):
+        await asyncio.sleep(self.flush_interval)
+        try:
+            await self.flush()
+        except Exception as e:
+            logger.error(f'Error while flushing task store: {e}')
+
+    def _remember(self, task: Task):
+        self._hot[task.id] = task
+        self._hot.move_to_end(task.id)
+        self._evict()
+
+    def _evict(self):
+        if len(self._hot) <= self.cache_size:
+            return
+        for task_id in list(self._hot):
+            if len(self._hot) <= self.cache_size:
+                break
+            if task_id not in self._dirty and task_id not in self._flushing:
+                del self._hot[task_id]
+
+
+class SQLiteTaskStore(CachedTaskStore):
+    """Stores tasks in a SQLite database in WAL mode.
+
+    Several server processes can share the same database file. In that
+    setup, pass ``cache_size=0`` so reads always see the other processes'
+    writes.
+    """
+
+    def __init__(self, path: str | os.PathLike, **kwargs):
+        super().__init__(**kwargs)
+        self.path = str(path)
+        self._db_lock = threading.Lock()
+        self._conn = sqlite3.connect(
+            self.path, check_same_thread=False, isolation_level=None
+        )
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute('PRAGMA synchronous=NORMAL')
+        self._conn.execute(
+            'CREATE TABLE IF NOT EXISTS tasks ('
+            'id TEXT PRIMARY KEY, data TEXT NOT NULL)'
+        )
+
+    def _read(self, task_id: str) -> str | None:
+        with self._db_lock:
+            row = self._conn.execute(
+                'SELECT data FROM tasks WHERE id = ?', (task_id,)
+            ).fetchone()
+        return row[0] if row else None
+
+    def _write_batch(self, records: list[tuple[str, str]]) -> None:
+        with self._db_lock:
+            self._conn.execute('BEGIN')
+            try:
+                self._conn.executemany(
+                    'INSERT INTO tasks (id, data) VALUES (?, ?) '
+                    'ON CONFLICT(id) DO UPDATE SET data = excluded.data',
+                    records,
+                )
+            except Exception:
+                self._conn.execute('ROLLBACK')
+                raise
+            self._conn.execute('COMMIT')
+
+    def _close_engine(self) -> None:
+        with self._db_lock:
+            self._conn.close()
+
+
+class LogTaskStore(CachedTaskStore):
+    """Stores tasks in append-only segment files.
+
+    Every save appends a new version of the task to the active segment.
+    An in-memory index maps each task id to the offset of its latest
+    version, so reads are a single seek. The index is rebuilt by scanning
+    the segments on startup. When a segment grows past ``segment_size`` a
+    new one is started, and ``compact()`` rewrites only the live records.
+    The index is per process, so this engine must not be shared between
+    server processes.
+    """
+
+    _HEADER = struct.Struct('>HI')
+
+    def __init__(
+        self,
+        directory: str | os.PathLike,
+        segment_size: int = 64 * 1024 * 1024,
+        fsync: bool = False,
+        **kwargs,
+    ):
+        super().__init__(**kwargs)
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.segment_size = segment_size
+        self.fsync = fsync
+        self._io_lock = threading.Lock()
+        # task_id -> (segment number, offset of the payload, payload length)
+        self._index: dict[str, tuple[int, int, int]] = {}
+        segments = self._segments()
+        for segment in segments:
+            valid_size = self._load_segment(segment)
+            if valid_size < self._segment_path(segment).stat().st_size:
+                # Drop the partial record, or records appended later would
+                # sit behind it and be lost on the next load.
+                os.truncate(self._segment_path(segment), valid_size)
+        self._segment = segments[-1] if segments else 1
+        self._writer = self._segment_path(self._segment).open('ab')
+
+    def _segments(self) -> list[int]:
+        return sorted(int(p.stem) for p in self.directory.glob('*.log'))
+
+    def _segment_path(self, segment: int) -> Path:
+        return self.directory / f'{segment:08d}.log'
+
+    def _load_segment(self, segment: int) -> int:
+        """Index the records of a segment, return the end of the last one."""
+        path = self._segment_path(segment)
+        size = path.stat().st_size
+        with path.open('rb') as f:
+            offset = 0
+            while True:
+                header = f.read(self._HEADER.size)
+                if not header:
+                    break
+                if len(header) < self._HEADER.size:
+                    logger.warning(f'Truncated record at the end of {path}')
+                    break
+                key_len, data_len = self._HEADER.unpack(header)
+                key = f.read(key_len)
+                f.seek(data_len, os.SEEK_CUR)
+                payload_offset = offset + self._HEADER.size + key_len
+                end = payload_offset + data_len
+                if len(key) < key_len or end > size:
+                    logger.warning(f'Truncated record at the end of {path}')
+                    break
+                self._index[key.decode()] = (segment, payload_offset, data_len)
+                offset = end
+        return offset
+
+    def _read(self, task_id: str) -> str | None:
+        with self._io_lock:
+            location = self._index.get(task_id)
+            if location is None:
+                return None
+            segment, offset, length = location
+            if segment == self._segment:
+                self._writer.flush()
+            with self._segment_path(segment).open('rb') as f:
+                f.seek(offset)
+                return f.read(length).decode()
+
+    def _write_batch(self, records: list[tuple[str, str]]) -> None:
+        with self._io_lock:
+            if self._writer.tell() >= self.segment_size:
+                self._rotate()
+            start = offset = self._writer.tell()
+            chunks = []
+            locations = {}
+            for task_id, data in records:
+                key = task_id.encode()
+                payload = data.encode()
+                chunks.append(self._HEADER.pack(len(key), len(payload)))
+                chunks.append(key)
+                chunks.append(payload)
+                offset += self._HEADER.size + len(key)
+                locations[task_id] = (self._segment, offset, len(payload))
+                offset += len(payload)
+            try:
+                self._writer.write(b''.join(chunks))
+                self._writer.flush()
+                if self.fsync:
+                    os.fsync(self._writer.fileno())
+            except Exception:
+                # Do not leave a partial batch for later records to follow.
+                try:
+                    self._writer.close()
+                except OSError:
+                    pass
+                path = self._segment_path(self._segment)
+                os.truncate(path, start)
+                self._writer = path.open('ab')
+                raise
+            # Only point at the new versions once they are written.
+            self._index.update(locations)
+
+    def _rotate(self):
+        self._writer.close()
+        self._segment += 1
+        self._writer = self._segment_path(self._segment).open('ab')
+
+    def compact(self) -> None:
+        """Rewrite the live version of every task into a fresh segment."""
+        with self._io_lock:
+            old_segments = self._segments()
+            self._writer.close()
+            self._segment += 1
+            path = self._segment_path(self._segment)
+            index = {}
+            with path.open('wb') as out:
+                for task_id, (segment, offset, length) in self._index.items():
+                    with self._segment_path(segment).open('rb') as f:
+                        f.seek(offset)
+                        payload = f.read(length)
+                    key = task_id.encode()
+                    out.write(self._HEADER.pack(len(key), len(payload)))
+                    out.write(key)
+                    index[task_id] = (self._segment, out.tell(), len(payload))
+                    out.write(payload)
+                out.flush()
+                os.fsync(out.fileno())
+            self._index = index
+            for segment in old_segments:
+                self._segment_path(segment).unlink()
+            self._writer = path.open('ab')
+
+    def _close_engine(self) -> None:
+        with self._io_lock:
+            self._writer.close()
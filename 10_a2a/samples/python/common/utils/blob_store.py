@@ -0,0 +1,173 @@
+"""Content-addressed store for large binary payloads."""
+
+import atexit
+import hashlib
+import mmap
+import os
+import shutil
+import tempfile
+import threading
+
+from collections import OrderedDict
+
+
+class BlobStore:
+    """Keeps binary payloads such as generated images out of the heap.
+
+    Blobs are identified by the SHA-256 of their content, so storing the
+    same bytes twice keeps one copy. Payloads of at least spill_threshold
+    bytes are written to a file in directory and read back through a
+    read-only memory map, smaller ones stay in memory. Only the blob id
+    needs to be kept in caches and models; encode to base64 at the wire
+    boundary only.
+
+    The store holds at most max_bytes. Beyond that the least recently used
+    blobs are deleted, so blobs of sessions the cache has dropped do not
+    accumulate. Callers must treat a missing blob (KeyError) as expired.
+    """
+
+    def __init__(
+        self,
+        directory: str | None = None,
+        spill_threshold: int = 64 * 1024,
+        max_bytes: int | None = 512 * 1024 * 1024,
+    ):
+        """Initialize the store.
+
+        Args:
+            directory: Where spilled blobs are written. Existing blobs in it
+                are reused. Defaults to a temporary directory removed at exit.
+            spill_threshold: Payloads of at least this many bytes go to disk.
+            max_bytes: Total size of the blobs kept, in memory and on disk.
+                None keeps every blob.
+        """
+        if directory is None:
+            directory = tempfile.mkdtemp(prefix='a2a-blobs-')
+            atexit.register(shutil.rmtree, directory, ignore_errors=True)
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self.spill_threshold = spill_threshold
+        self.max_bytes = max_bytes
+        self._small: dict[str, bytes] = {}
+        # Size of every blob, least recently used first.
+        self._sizes: OrderedDict[str, int] = OrderedDict()
+        self._total_bytes = 0
+        self._lock = threading.Lock()
+        existing = sorted(
+            (entry for entry in os.scandir(directory) if _is_blob_id(entry.name)),
+            key=lambda entry: entry.stat().st_mtime,
+        )
+        for entry in existing:
+            self._sizes[entry.name] = entry.stat().st_size
+            self._total_bytes += self._sizes[entry.name]
+
+    def put(self, data: bytes) -> str:
+        """Store a payload.
+
+        Args:
+            data: The raw bytes, not base64.
+
+        Returns:
+            The blob id.
+        """
+        blob_id = hashlib.sha256(data).hexdigest()
+        # Empty files cannot be memory mapped, keep them in memory too.
+        if not data or len(data) < self.spill_threshold:
+            with self._lock:
+                self._small[blob_id] = bytes(data)
+                self._track(blob_id, len(data))
+            return blob_id
+
+        path = self._path(blob_id)
+        if not os.path.exists(path):
+            # Write under a unique name and rename, so readers never see a
+            # partial file and concurrent writers of the same blob agree.
+            fd, tmp_path = tempfile.mkstemp(dir=self.directory)
+            with os.fdopen(fd, 'wb') as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        with self._lock:
+            self._track(blob_id, len(data))
+        return blob_id
+
+    def get(self, blob_id: str) -> memoryview:
+        """Return the payload without copying it into the heap.
+
+        Args:
+            blob_id: The id returned by put().
+
+        Returns:
+            A read-only view of the bytes, backed by a memory map for
+            spilled blobs.
+
+        Raises:
+            KeyError: If the blob does not exist.
+        """
+        with self._lock:
+            data = self._small.get(blob_id)
+            if blob_id in self._sizes:
+                self._sizes.move_to_end(blob_id)
+        if data is not None:
+            return memoryview(data)
+
+        try:
+            with open(self._path(blob_id), 'rb') as f:
+                mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except FileNotFoundError as e:
+            raise KeyError(blob_id) from e
+        return memoryview(mapped)
+
+    def path(self, blob_id: str) -> str | None:
+        """Return the file backing a spilled blob, for sendfile responses.
+
+        Returns:
+            The file path, or None if the blob is held in memory or missing.
+        """
+        path = self._path(blob_id)
+        return path if os.path.exists(path) else None
+
+    def delete(self, blob_id: str) -> bool:
+        """Delete a blob.
+
+        Returns:
+            True if the blob was found and deleted, False otherwise.
+        """
+        with self._lock:
+            return self._delete_locked(blob_id)
+
+    def __contains__(self, blob_id: str) -> bool:
+        with self._lock:
+            if blob_id in self._small:
+                return True
+        return os.path.exists(self._path(blob_id))
+
+    def _path(self, blob_id: str) -> str:
+        return os.path.join(self.directory, blob_id)
+
+    def _track(self, blob_id: str, size: int) -> None:
+        """Record a stored blob and evict down to max_bytes. Needs _lock."""
+        if blob_id not in self._sizes:
+            self._sizes[blob_id] = size
+            self._total_bytes += size
+        self._sizes.move_to_end(blob_id)
+        if self.max_bytes is None:
+            return
+        # The blob just stored is kept even if it alone exceeds the limit.
+        while self._total_bytes > self.max_bytes and len(self._sizes) > 1:
+            oldest = next(iter(self._sizes))
+            self._delete_locked(oldest)
+
+    def _delete_locked(self, blob_id: str) -> bool:
+        self._total_bytes -= self._sizes.pop(blob_id, 0)
+        if self._small.pop(blob_id, None) is not None:
+            return True
+        try:
+            # Open memory maps of the file stay valid after the unlink.
+            os.remove(self._path(blob_id))
+            return True
+        except FileNotFoundError:
+            return False
+
+
+def _is_blob_id(name: str) -> bool:
+    return len(name) == 64 and all(c in '0123456789abcdef' for c in name)
@@ -0,0 +1,436 @@
+"""In Memory Cache utility."""
+
+import asyncio
+import heapq
+import sys
+import threading
+import time
+
+from collections import OrderedDict
+from typing import Any, Literal, Optional
+
+
+EvictionPolicy = Literal['lru', 'lfu']
+
+
+def estimate_size(value: Any, _depth: int = 0) -> int:
+    """Roughly estimate the memory used by a value, in bytes.
+
+    Follows containers and object attributes a few levels deep, which is
+    enough for the session dicts of pydantic models stored by the agents.
+
+    Args:
+        value: The value to measure.
+
+    Returns:
+        The estimated size in bytes.
+    """
+    size = sys.getsizeof(value)
+    if _depth >= 4 or isinstance(value, str | bytes | bytearray):
+        return size
+    if isinstance(value, dict):
+        size += sum(
+            estimate_size(k, _depth + 1) + estimate_size(v, _depth + 1)
+            for k, v in value.items()
+        )
+    elif isinstance(value, list | tuple | set | frozenset):
+        size += sum(estimate_size(item, _depth + 1) for item in value)
+    elif hasattr(value, '__dict__'):
+        size += estimate_size(vars(value), _depth + 1)
+    return size
+
+
+def _share(limit: int | None, shards: int) -> int | None:
+    """Split a cache-wide bound evenly across shards, rounding up."""
+    if limit is None:
+        return None
+    return -(-limit // shards)
+
+
+class _CacheShard:
+    """One independently locked segment of the cache.
+
+    Methods ending in _locked must be called with the shard lock held.
+    """
+
+    def __init__(
+        self,
+        max_entries: int | None,
+        max_bytes: int | None,
+        eviction_policy: EvictionPolicy,
+    ):
+        self.lock = threading.Lock()
+        self.data: OrderedDict[str, Any] = OrderedDict()
+        self.ttl: dict[str, float] = {}
+        self.sizes: dict[str, int] = {}
+        self.frequency: dict[str, int] = {}
+        self.total_bytes = 0
+        self.stats = {'hits': 0, 'misses': 0, 'evictions': 0, 'expirations': 0}
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.eviction_policy = eviction_policy
+
+    def set_locked(
+        self, key: str, value: Any, size: int, expires_at: float | None
+    ) -> None:
+        self.total_bytes += size - self.sizes.get(key, 0)
+        self.sizes[key] = size
+        self.data[key] = value
+        self.data.move_to_end(key)
+        self.frequency.setdefault(key, 0)
+        if expires_at is not None:
+            self.ttl[key] = expires_at
+        else:
+            self.ttl.pop(key, None)
+        self.evict_locked(keep=key)
+
+    def get_locked(self, key: str, now: float, default: Any) -> Any:
+        expires_at = self.ttl.get(key)
+        if expires_at is not None and now > expires_at:
+            self.remove_locked(key)
+            self.stats['expirations'] += 1
+            self.stats['misses'] += 1
+            return default
+        if key not in self.data:
+            self.stats['misses'] += 1
+            return default
+        self.stats['hits'] += 1
+        self.frequency[key] += 1
+        self.data.move_to_end(key)
+        return self.data[key]
+
+    def expire_locked(self, key: str, now: float) -> float | None:
+        """Remove the key if it has expired.
+
+        Returns:
+            The deadline of a key that has not expired yet, it was extended
+            by a later set().
+        """
+        expires_at = self.ttl.get(key)
+        if expires_at is None:
+            return None
+        if expires_at > now:
+            return expires_at
+        self.remove_locked(key)
+        self.stats['expirations'] += 1
+        return None
+
+    def clear_locked(self) -> None:
+        self.data.clear()
+        self.ttl.clear()
+        self.sizes.clear()
+        self.frequency.clear()
+        self.total_bytes = 0
+
+    def remove_locked(self, key: str) -> None:
+        del self.data[key]
+        self.ttl.pop(key, None)
+        self.frequency.pop(key, None)
+        self.total_bytes -= self.sizes.pop(key, 0)
+
+    def evict_locked(self, keep: str | None = None) -> None:
+        """Evict entries until the shard is within its bounds.
+
+        The entry just written (keep) is evicted last, so a single value
+        larger than max_bytes is still stored.
+        """
+        while len(self.data) > 1 and (
+            (self.max_entries is not None and len(self.data) > self.max_entries)
+            or (self.max_bytes is not None and self.total_bytes > self.max_bytes)
+        ):
+            candidates = (k for k in self.data if k != keep)
+            if self.eviction_policy == 'lfu':
+                victim = min(candidates, key=self.frequency.__getitem__)
+            else:
+                victim = next(candidates)
+            self.remove_locked(victim)
+            self.stats['evictions'] += 1
+
+
+class InMemoryCache:
+    """A thread-safe Singleton class to manage cache data.
+
+    Ensures only one instance of the cache exists across the application.
+    The cache is bounded by entry count and estimated size. When a bound is
+    exceeded, the least recently used ('lru') or least frequently used
+    ('lfu') entry is evicted. Expired entries are removed by a background
+    sweeper thread, not only when they are read again.
+
+    By default all keys share one lock. Pass shards > 1 on first
+    construction to hash keys to that many independently locked segments,
+    so threads working on different keys do not wait on each other. The
+    bounds are then enforced per shard, and eviction order is only LRU/LFU
+    within a shard.
+    """
+
+    _instance: Optional['InMemoryCache'] = None
+    _lock: threading.Lock = threading.Lock()
+    _initialized: bool = False
+
+    def __new__(cls, *args, **kwargs):
+        """Override __new__ to control instance creation (Singleton pattern).
+
+        Uses a lock to ensure thread safety during the first instantiation.
+
+        Returns:
+            The singleton instance of InMemoryCache.
+        """
+        if cls._instance is None:
+            with cls._lock:
+                if cls._instance is None:
+                    cls._instance = super().__new__(cls)
+        return cls._instance
+
+    def __init__(
+        self,
+        max_entries: int | None = 10_000,
+        max_bytes: int | None = 256 * 1024 * 1024,
+        eviction_policy: EvictionPolicy = 'lru',
+        shards: int = 1,
+    ):
+        """Initialize the cache storage.
+
+        Uses a flag (_initialized) to ensure this logic runs only on the very first
+        creation of the singleton instance. Use configure() to change the bounds
+        afterwards.
+
+        Args:
+            max_entries: Maximum number of entries, None for no limit.
+            max_bytes: Maximum estimated size of all values, None for no limit.
+            eviction_policy: 'lru' or 'lfu'.
+            shards: Number of independently locked segments.
+        """
+        if not self._initialized:
+            with self._lock:
+                if not self._initialized:
+                    # print("Initializing SessionCache storage")
+                    if shards < 1:
+                        raise ValueError('shards must be at least 1')
+                    self._shards = [
+                        _CacheShard(
+                            _share(max_entries, shards),
+                            _share(max_bytes, shards),
+                            eviction_policy,
+                        )
+                        for _ in range(shards)
+                    ]
+                    self._expiry_heap: list[tuple[float, str]] = []
+                    # Earliest deadline in the heap per key.
+                    self._scheduled: dict[str, float] = {}
+                    self._sweeper_wakeup = threading.Condition()
+                    self._sweeper: threading.Thread | None = None
+                    self.max_entries = max_entries
+                    self.max_bytes = max_bytes
+                    self.eviction_policy = eviction_policy
+                    self._initialized = True
+
+    def configure(
+        self,
+        max_entries: int | None = None,
+        max_bytes: int | None = None,
+        eviction_policy: EvictionPolicy | None = None,
+    ) -> None:
+        """Change the cache bounds, evicting entries if they no longer fit.
+
+        Args:
+            max_entries: Maximum number of entries.
+            max_bytes: Maximum estimated size of all values.
+            eviction_policy: 'lru' or 'lfu'.
+        """
+        if max_entries is not None:
+            self.max_entries = max_entries
+        if max_bytes is not None:
+            self.max_bytes = max_bytes
+        if eviction_policy is not None:
+            self.eviction_policy = eviction_policy
+        shards = len(self._shards)
+        for shard in self._shards:
+            with shard.lock:
+                shard.max_entries = _share(self.max_entries, shards)
+                shard.max_bytes = _share(self.max_bytes, shards)
+                shard.eviction_policy = self.eviction_policy
+                shard.evict_locked()
+
+    def set(self, key: str, value: Any, ttl: int | None = None) -> None:
+        """Set a key-value pair.
+
+        Values mutated in place after set() keep their original size
+        estimate, call set() again to account for the change.
+
+        Args:
+            key: The key for the data.
+            value: The data to store.
+            ttl: Time to live in seconds. If None, data will not expire.
+        """
+        size, expires_at = self._prepare(value, ttl)
+        shard = self._shard(key)
+        with shard.lock:
+            shard.set_locked(key, value, size, expires_at)
+        if expires_at is not None:
+            self._schedule_expiry(key, expires_at)
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """Get the value associated with a key.
+
+        Args:
+            key: The key for the data within the session.
+            default: The value to return if the session or key is not found.
+
+        Returns:
+            The cached value, or the default value if not found.
+        """
+        now = time.monotonic()
+        shard = self._shard(key)
+        with shard.lock:
+            return shard.get_locked(key, now, default)
+
+    def delete(self, key: str) -> None:
+        """Delete a specific key-value pair from a cache.
+
+        Args:
+            key: The key to delete.
+
+        Returns:
+            True if the key was found and deleted, False otherwise.
+        """
+        shard = self._shard(key)
+        with shard.lock:
+            if key in shard.data:
+                shard.remove_locked(key)
+                return True
+            return False
+
+    def clear(self) -> bool:
+        """Remove all data.
+
+        Returns:
+            True if the data was cleared, False otherwise.
+        """
+        for shard in self._shards:
+            with shard.lock:
+                shard.clear_locked()
+        with self._sweeper_wakeup:
+            self._expiry_heap.clear()
+            self._scheduled.clear()
+        return True
+
+    def stats(self) -> dict[str, int]:
+        """Return hit, miss, eviction and expiration counters.
+
+        Returns:
+            The counters plus the current number of entries and bytes.
+        """
+        totals = {
+            'hits': 0,
+            'misses': 0,
+            'evictions': 0,
+            'expirations': 0,
+            'entries': 0,
+            'bytes': 0,
+        }
+        for shard in self._shards:
+            with shard.lock:
+                for name, count in shard.stats.items():
+                    totals[name] += count
+                totals['entries'] += len(shard.data)
+                totals['bytes'] += shard.total_bytes
+        return totals
+
+    def _shard(self, key: str) -> _CacheShard:
+        return self._shards[hash(key) % len(self._shards)]
+
+    @staticmethod
+    def _prepare(value: Any, ttl: int | None) -> tuple[int, float | None]:
+        # Sizing and reading the clock happen before any lock is taken.
+        expires_at = time.monotonic() + ttl if ttl is not None else None
+        return estimate_size(value), expires_at
+
+    def _schedule_expiry(self, key: str, expires_at: float) -> None:
+        with self._sweeper_wakeup:
+            scheduled = self._scheduled.get(key)
+            if scheduled is not None and scheduled <= expires_at:
+                # The sweeper reschedules the key when that entry is due.
+                return
+            self._scheduled[key] = expires_at
+            heapq.heappush(self._expiry_heap, (expires_at, key))
+            if len(self._expiry_heap) > 2 * len(self._scheduled) + 64:
+                # Drop the entries superseded by earlier deadlines.
+                self._expiry_heap = [
+                    (deadline, k) for k, deadline in self._scheduled.items()
+                ]
+                heapq.heapify(self._expiry_heap)
+            if self._sweeper is None:
+                self._sweeper = threading.Thread(
+                    target=self._sweep_expired,
+                    name='InMemoryCache-sweeper',
+                    daemon=True,
+                )
+                self._sweeper.start()
+            self._sweeper_wakeup.notify()
+
+    def _sweep_expired(self) -> None:
+        """Remove expired entries as they expire, in deadline order."""
+        while True:
+            with self._sweeper_wakeup:
+                if not self._expiry_heap:
+                    self._sweeper_wakeup.wait()
+                    continue
+                expires_at, key = self._expiry_heap[0]
+                delay = expires_at - time.monotonic()
+                if delay > 0:
+                    self._sweeper_wakeup.wait(delay)
+                    continue
+                heapq.heappop(self._expiry_heap)
+                if self._scheduled.get(key) == expires_at:
+                    del self._scheduled[key]
+            shard = self._shard(key)
+            with shard.lock:
+                later = shard.expire_locked(key, time.monotonic())
+            if later is not None:
+                self._schedule_expiry(key, later)
+
+
+class AsyncInMemoryCache:
+    """Asyncio front end for InMemoryCache.
+
+    Shares the data of the InMemoryCache singleton, so agents running on an
+    event loop and tools running in worker threads see the same entries.
+    Each call first tries to take the shard lock without blocking. If a
+    worker thread holds it, the call is handed to a thread instead of
+    stalling the event loop.
+    """
+
+    def __init__(self, cache: InMemoryCache | None = None):
+        self.cache = cache if cache is not None else InMemoryCache()
+
+    async def get(self, key: str, default: Any = None) -> Any:
+        now = time.monotonic()
+        shard = self.cache._shard(key)
+        if shard.lock.acquire(blocking=False):
+            try:
+                return shard.get_locked(key, now, default)
+            finally:
+                shard.lock.release()
+        return await asyncio.to_thread(self.cache.get, key, default)
+
+    async def set(self, key: str, value: Any, ttl: int | None = None) -> None:
+        size, expires_at = self.cache._prepare(value, ttl)
+        shard = self.cache._shard(key)
+        if shard.lock.acquire(blocking=False):
+            try:
+                shard.set_locked(key, value, size, expires_at)
+            finally:
+                shard.lock.release()
+            if expires_at is not None:
+                self.cache._schedule_expiry(key, expires_at)
+            return
+        await asyncio.to_thread(self.cache.set, key, value, ttl)
+
+    async def delete(self, key: str) -> bool:
+        return await asyncio.to_thread(self.cache.delete, key)
+
+    async def clear(self) -> bool:
+        return await asyncio.to_thread(self.cache.clear)
+
+    def stats(self) -> dict[str, int]:
+        return self.cache.stats()
@@ -0,0 +1,255 @@
+import asyncio
+import hashlib
+import json
+import logging
+import time
+import uuid
+
+from collections import OrderedDict
+from typing import Any
+
+import httpx
+import jwt
+
+from jwcrypto import jwk
+from jwt import PyJWK
+from starlette.requests import Request
+from starlette.responses import JSONResponse
+
+from common.utils.push_notification_queue import PushNotificationQueue
+
+
+logger = logging.getLogger(__name__)
+AUTH_HEADER_PREFIX = 'Bearer '
+
+# Signing algorithm -> jwcrypto key generation parameters. ES256 and EdDSA
+# sign an order of magnitude faster than RS256.
+SIGNING_KEY_PARAMS = {
+    'RS256': {'kty': 'RSA', 'size': 2048},
+    'ES256': {'kty': 'EC', 'crv': 'P-256'},
+    'EdDSA': {'kty': 'OKP', 'crv': 'Ed25519'},
+}
+
+
+class PushNotificationAuth:
+    def _serialize_request_body(self, data: dict[str, Any]) -> bytes:
+        """Serializes a request body the way it is signed and sent."""
+        return json.dumps(
+            data,
+            ensure_ascii=False,
+            allow_nan=False,
+            indent=None,
+            separators=(',', ':'),
+        ).encode()
+
+    def _calculate_request_body_sha256(self, data: dict[str, Any] | bytes):
+        """Calculates the SHA256 hash of a request body.
+
+        This logic needs to be same for both the agent who signs the payload and the client verifier.
+        Raw bytes are hashed as they are, so a verifier can hash the body it
+        received without parsing it.
+        """
+        if not isinstance(data, bytes):
+            data = self._serialize_request_body(data)
+        return hashlib.sha256(data).hexdigest()
+
+
+class PushNotificationSenderAuth(PushNotificationAuth):
+    def __init__(self, token_ttl: float = 60.0, **queue_kwargs):
+        """Keyword arguments configure the PushNotificationQueue.
+
+        A token signed for a body is reused for up to token_ttl seconds, so
+        retries and repeated notifications are not signed again.
+        """
+        self.public_keys = []
+        self.private_key_jwk: PyJWK = None
+        self.algorithm = 'RS256'
+        self.token_ttl = token_ttl
+        self._token_cache: OrderedDict[str, tuple[float, str]] = OrderedDict()
+        self.queue = PushNotificationQueue(
+            self._build_request, **queue_kwargs
+        )
+
+    @staticmethod
+    async def verify_push_notification_url(url: str) -> bool:
+        async with httpx.AsyncClient(timeout=10) as client:
+            try:
+                validation_token = str(uuid.uuid4())
+                response = await client.get(
+                    url, params={'validationToken': validation_token}
+                )
+                response.raise_for_status()
+                is_verified = response.text == validation_token
+
+                logger.info(
+                    f'Verified push-notification URL: {url} => {is_verified}'
+                )
+                return is_verified
+            except Exception as e:
+                logger.warning(
+                    f'Error during sending push-notification for URL {url}: {e}'
+                )
+
+        return False
+
+    def generate_jwk(self, algorithm: str = 'RS256'):
+        """Generates a new signing key, its public part is added to the JWKS.
+
+        Args:
+            algorithm: 'RS256', 'ES256' or 'EdDSA'.
+        """
+        if algorithm not in SIGNING_KEY_PARAMS:
+            raise ValueError(f'Unsupported signing algorithm: {algorithm}')
+        key = jwk.JWK.generate(
+            **SIGNING_KEY_PARAMS[algorithm],
+            kid=str(uuid.uuid4()),
+            use='sig',
+            alg=algorithm,
+        )
+        self.public_keys.append(key.export_public(as_dict=True))
+        self.private_key_jwk = PyJWK.from_json(
+            key.export_private(), algorithm=algorithm
+        )
+        self.algorithm = algorithm
+        self._token_cache.clear()
+
+    def handle_jwks_endpoint(self, _request: Request):
+        """Allow clients to fetch public keys."""
+        return JSONResponse({'keys': self.public_keys})
+
+    def _generate_jwt(self, data: dict[str, Any] | bytes):
+        """JWT is generated by signing both the request payload SHA digest and time of token generation.
+
+        Payload is signed with private key and it ensures the integrity of payload for client.
+        Including iat prevents from replay attack.
+        """
+        body_sha256 = self._calculate_request_body_sha256(data)
+        now = time.time()
+        cached = self._token_cache.get(body_sha256)
+        if cached is not None and now - cached[0] < self.token_ttl:
+            return cached[1]
+
+        iat = int(now)
+        token = jwt.encode(
+            {
+                'iat': iat,
+                'request_body_sha256': body_sha256,
+            },
+            key=self.private_key_jwk,
+            headers={'kid': self.private_key_jwk.key_id},
+            algorithm=self.algorithm,
+        )
+        self._token_cache[body_sha256] = (iat, token)
+        if len(self._token_cache) > 1024:
+            self._token_cache.popitem(last=False)
+        return token
+
+    def _build_request(
+        self, data: dict[str, Any]
+    ) -> tuple[bytes, dict[str, str]]:
+        # The body is serialized once and the token signs those exact
+        # bytes, so the receiver can verify the raw request body.
+        body = self._serialize_request_body(data)
+        headers = {
+            'Authorization': f'Bearer {self._generate_jwt(body)}',
+            'Content-Type': 'application/json',
+        }
+        return body, headers
+
+    async def send_push_notification(self, url: str, data: dict[str, Any]):
+        """Queues the notification, delivery happens in the background."""
+        self.queue.enqueue(url, data)
+
+    async def close(self):
+        """Delivers queued notifications and releases the connections."""
+        await self.queue.close()
+
+
+class PushNotificationReceiverAuth(PushNotificationAuth):
+    def __init__(self, jwks_refresh_interval: float = 30.0):
+        """Keys are cached by kid. The JWKS is fetched on the first
+        verification, and an unknown kid refetches it at most once every
+        jwks_refresh_interval seconds.
+        """
+        self.public_keys_jwks = []
+        self.jwks_url = None
+        self.jwks_refresh_interval = jwks_refresh_interval
+        self._signing_keys: dict[str, PyJWK] = {}
+        self._jwks_fetched_at: float | None = None
+        # Verifications that miss the same kid share one refresh.
+        self._jwks_lock = asyncio.Lock()
+
+    async def load_jwks(self, jwks_url: str):
+        # Fetched lazily, the agent may not serve its keys yet.
+        self.jwks_url = jwks_url
+        self._signing_keys = {}
+        self._jwks_fetched_at = None
+
+    async def verify_push_notification(self, request: Request) -> bool:
+        auth_header = request.headers.get('Authorization')
+        if not auth_header or not auth_header.startswith(AUTH_HEADER_PREFIX):
+            print('Invalid authorization header')
+            return False
+
+        token = auth_header[len(AUTH_HEADER_PREFIX) :]
+        signing_key = await self._get_signing_key(token)
+
+        decode_token = jwt.decode(
+            token,
+            signing_key,
+            options={'require': ['iat', 'request_body_sha256']},
+            algorithms=[signing_key.algorithm_name],
+        )
+
+        body = await request.body()
+        expected_body_sha256 = decode_token['request_body_sha256']
+        if (
+            self._calculate_request_body_sha256(body) != expected_body_sha256
+            and self._calculate_request_body_sha256(json.loads(body))
+            != expected_body_sha256
+        ):
+            # Payload signature does not match the digest in signed token.
+            # Senders that serialize differently are still accepted, the
+            # body is only parsed and re-serialized for them.
+            raise ValueError('Invalid request body')
+
+        if time.time() - decode_token['iat'] > 60 * 5:
+            # Do not allow push-notifications older than 5 minutes.
+            # This is to prevent replay attack.
+            raise ValueError('Token is expired')
+
+        return True
+
+    async def _get_signing_key(self, token: str) -> PyJWK:
+        kid = jwt.get_unverified_header(token).get('kid')
+        signing_key = self._signing_keys.get(kid)
+        if signing_key is None:
+            async with self._jwks_lock:
+                # Another verification may have refreshed the keys already.
+                signing_key = self._signing_keys.get(kid)
+                if signing_key is None and (
+                    self._jwks_fetched_at is None
+                    or time.monotonic() - self._jwks_fetched_at
+                    >= self.jwks_refresh_interval
+                ):
+                    # The sender may have rotated its key.
+                    await self._refresh_jwks()
+                    signing_key = self._signing_keys.get(kid)
+        if signing_key is None:
+            raise ValueError(f'Unknown signing key: {kid}')
+        return signing_key
+
+    async def _refresh_jwks(self):
+        async with httpx.AsyncClient(timeout=10) as client:
+            response = await client.get(self.jwks_url)
+            response.raise_for_status()
+        self.public_keys_jwks = response.json()['keys']
+        signing_keys = {}
+        for key in self.public_keys_jwks:
+            try:
+                signing_keys[key['kid']] = PyJWK(key)
+            except jwt.PyJWTError as e:
+                logger.warning(f'Skipping unusable JWK {key.get("kid")}: {e}')
+        self._signing_keys = signing_keys
+        # Only a successful fetch delays the next one.
+        self._jwks_fetched_at = time.monotonic()
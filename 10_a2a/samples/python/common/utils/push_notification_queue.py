@@ -0,0 +1,202 @@
+"""Asynchronous delivery of push notifications."""
+
+import asyncio
+import logging
+import random
+import time
+
+from collections.abc import Callable
+from typing import Any
+
+import httpx
+
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_LIMITS = httpx.Limits(
+    max_connections=200, max_keepalive_connections=50, keepalive_expiry=30
+)
+
+# Statuses worth retrying, other 4xx responses are final.
+RETRYABLE_STATUS_CODES = {408, 425, 429}
+
+
+class PushNotificationQueue:
+    """Delivers push notifications from worker tasks, off the agent's path.
+
+    Notifications are queued per (url, task id). If a newer notification
+    for the same task and URL arrives before the previous one was sent,
+    it replaces it, so a webhook only receives the latest task state. Each
+    destination gets at most rate_limit requests per second, and failed
+    deliveries are retried with exponential backoff and jitter. All
+    workers share one httpx client, which keeps a connection pool per
+    destination.
+    """
+
+    def __init__(
+        self,
+        request_factory: Callable[
+            [dict[str, Any]], tuple[bytes, dict[str, str]]
+        ],
+        workers: int = 16,
+        max_queue_size: int = 10_000,
+        max_retries: int = 5,
+        retry_backoff: float = 0.5,
+        max_retry_backoff: float = 30.0,
+        rate_limit: float | None = None,
+        timeout: float = 10.0,
+        httpx_client: httpx.AsyncClient | None = None,
+    ):
+        """Initialize the queue.
+
+        Args:
+            request_factory: Builds the request body and headers for a
+                payload. It is called for every attempt, so signed tokens
+                stay fresh.
+            workers: Number of concurrent delivery tasks.
+            max_queue_size: Notifications beyond this are dropped.
+            max_retries: Retries after the first failed attempt.
+            retry_backoff: Delay before the first retry, in seconds.
+            max_retry_backoff: Upper bound of the retry delay.
+            rate_limit: Maximum requests per second per URL, None for no
+                limit.
+            timeout: Request timeout in seconds.
+            httpx_client: Client to send with, created on first use if None.
+        """
+        self.request_factory = request_factory
+        self.workers = workers
+        self.max_queue_size = max_queue_size
+        self.max_retries = max_retries
+        self.retry_backoff = retry_backoff
+        self.max_retry_backoff = max_retry_backoff
+        self.rate_limit = rate_limit
+        self.timeout = timeout
+        self.stats = {
+            'sent': 0,
+            'failed': 0,
+            'retried': 0,
+            'coalesced': 0,
+            'dropped': 0,
+        }
+        self._httpx_client = httpx_client
+        self._owns_client = httpx_client is None
+        self._queue: asyncio.Queue[tuple[str, Any]] | None = None
+        self._pending: dict[tuple[str, Any], dict[str, Any]] = {}
+        self._delivering: dict[tuple[str, Any], asyncio.Event] = {}
+        self._next_slot: dict[str, float] = {}
+        self._worker_tasks: list[asyncio.Task] = []
+
+    def enqueue(self, url: str, data: dict[str, Any]) -> None:
+        """Queue a notification and return immediately.
+
+        Must be called from the event loop the workers should run on.
+        """
+        if self._queue is None:
+            self._start()
+
+        key = (url, data.get('id', object()))
+        if key in self._pending:
+            self._pending[key] = data
+            self.stats['coalesced'] += 1
+            return
+        if self._queue.qsize() >= self.max_queue_size:
+            self.stats['dropped'] += 1
+            logger.warning(f'Push-notification queue full, dropping for {url}')
+            return
+        self._pending[key] = data
+        self._queue.put_nowait(key)
+
+    async def flush(self) -> None:
+        """Wait until every queued notification was delivered or given up."""
+        if self._queue is not None:
+            await self._queue.join()
+
+    async def close(self) -> None:
+        """Deliver what is queued, then stop the workers."""
+        await self.flush()
+        for task in self._worker_tasks:
+            task.cancel()
+        await asyncio.gather(*self._worker_tasks, return_exceptions=True)
+        self._worker_tasks.clear()
+        self._queue = None
+        if self._owns_client and self._httpx_client is not None:
+            await self._httpx_client.aclose()
+            self._httpx_client = None
+
+    def _start(self) -> None:
+        self._queue = asyncio.Queue()
+        if self._httpx_client is None:
+            self._httpx_client = httpx.AsyncClient(
+                timeout=self.timeout, limits=DEFAULT_LIMITS
+            )
+        self._worker_tasks = [
+            asyncio.create_task(self._work()) for _ in range(self.workers)
+        ]
+
+    async def _work(self) -> None:
+        while True:
+            key = await self._queue.get()
+            try:
+                # Keep notifications for one task and URL in order.
+                while (delivering := self._delivering.get(key)) is not None:
+                    await delivering.wait()
+                data = self._pending.pop(key)
+                self._delivering[key] = asyncio.Event()
+                try:
+                    await self._deliver(key, data)
+                finally:
+                    self._delivering.pop(key).set()
+            except Exception as e:
+                logger.error(f'Unexpected push-notification error: {e}')
+            finally:
+                self._queue.task_done()
+
+    async def _deliver(self, key: tuple[str, Any], data: dict[str, Any]):
+        url = key[0]
+        for attempt in range(self.max_retries + 1):
+            if attempt:
+                if key in self._pending:
+                    # A newer notification supersedes this one.
+                    self.stats['coalesced'] += 1
+                    return
+                self.stats['retried'] += 1
+                await asyncio.sleep(self._backoff(attempt))
+
+            await self._wait_for_slot(url)
+            try:
+                content, headers = self.request_factory(data)
+                response = await self._httpx_client.post(
+                    url, content=content, headers=headers
+                )
+                response.raise_for_status()
+                self.stats['sent'] += 1
+                logger.info(f'Push-notification sent for URL: {url}')
+                return
+            except httpx.HTTPError as e:
+                error = e
+                if (
+                    isinstance(e, httpx.HTTPStatusError)
+                    and e.response.status_code < 500
+                    and e.response.status_code not in RETRYABLE_STATUS_CODES
+                ):
+                    break
+
+        self.stats['failed'] += 1
+        logger.warning(
+            f'Error during sending push-notification for URL {url}: {error}'
+        )
+
+    def _backoff(self, attempt: int) -> float:
+        delay = min(
+            self.retry_backoff * 2 ** (attempt - 1), self.max_retry_backoff
+        )
+        return delay * random.uniform(0.5, 1.0)
+
+    async def _wait_for_slot(self, url: str) -> None:
+        if self.rate_limit is None:
+            return
+        now = time.monotonic()
+        slot = max(now, self._next_slot.get(url, now))
+        self._next_slot[url] = slot + 1 / self.rate_limit
+        if slot > now:
+            await asyncio.sleep(slot - now)
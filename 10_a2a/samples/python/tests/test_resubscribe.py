@@ -0,0 +1,108 @@
+import asyncio
+
+from common.server.task_manager import InMemoryTaskManager
+from common.types import (
+    Message,
+    TaskResubscriptionRequest,
+    TaskSendParams,
+    TaskState,
+    TaskStatus,
+    TaskStatusUpdateEvent,
+    TextPart,
+)
+
+
+class TaskManager(InMemoryTaskManager):
+    async def on_send_task(self, request):
+        raise NotImplementedError
+
+    async def on_send_task_subscribe(self, request):
+        raise NotImplementedError
+
+
+def status_event(task_id: str, state: TaskState, final: bool = False):
+    return TaskStatusUpdateEvent(
+        id=task_id, status=TaskStatus(state=state), final=final
+    )
+
+
+async def create_task(manager: TaskManager, task_id: str):
+    await manager.upsert_task(
+        TaskSendParams(
+            id=task_id,
+            sessionId='session',
+            message=Message(role='user', parts=[TextPart(text='hi')]),
+        )
+    )
+
+
+async def resubscribe(manager: TaskManager, task_id: str, last_event_id=None):
+    metadata = {'lastEventId': str(last_event_id)} if last_event_id else None
+    stream = await manager.on_resubscribe_to_task(
+        TaskResubscriptionRequest(
+            id=1, params={'id': task_id, 'metadata': metadata}
+        )
+    )
+    return [
+        (response._event_id, response.result.status.state)
+        async for response in stream
+    ]
+
+
+def test_resubscribe_replays_events_after_last_event_id():
+    async def run():
+        manager = TaskManager()
+        await create_task(manager, 'task')
+        for state in (TaskState.WORKING, TaskState.INPUT_REQUIRED):
+            await manager.enqueue_events_for_sse(
+                'task', status_event('task', state)
+            )
+        await manager.enqueue_events_for_sse(
+            'task', status_event('task', TaskState.COMPLETED, final=True)
+        )
+        return await resubscribe(manager, 'task', last_event_id=1)
+
+    assert asyncio.run(run()) == [
+        (2, TaskState.INPUT_REQUIRED),
+        (3, TaskState.COMPLETED),
+    ]
+
+
+def test_resubscribe_continues_with_live_events():
+    async def run():
+        manager = TaskManager()
+        await create_task(manager, 'task')
+        await manager.enqueue_events_for_sse(
+            'task', status_event('task', TaskState.WORKING)
+        )
+        events = asyncio.create_task(resubscribe(manager, 'task'))
+        await asyncio.sleep(0)
+        await manager.enqueue_events_for_sse(
+            'task', status_event('task', TaskState.COMPLETED, final=True)
+        )
+        return await events
+
+    assert asyncio.run(run()) == [
+        (1, TaskState.WORKING),
+        (2, TaskState.COMPLETED),
+    ]
+
+
+def test_event_ids_keep_increasing_after_journal_eviction():
+    async def run():
+        manager = TaskManager(max_journals=1)
+        await create_task(manager, 'a')
+        await create_task(manager, 'b')
+        await manager.enqueue_events_for_sse(
+            'a', status_event('a', TaskState.WORKING)
+        )
+        # Evicts the journal of task a.
+        await manager.enqueue_events_for_sse(
+            'b', status_event('b', TaskState.WORKING)
+        )
+        await manager.enqueue_events_for_sse(
+            'a', status_event('a', TaskState.COMPLETED, final=True)
+        )
+        return await resubscribe(manager, 'a', last_event_id=1)
+
+    assert asyncio.run(run()) == [(3, TaskState.COMPLETED)]
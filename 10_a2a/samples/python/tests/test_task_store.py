@@ -0,0 +1,106 @@
+import asyncio
+
+import pytest
+
+from common.server.task_store import LogTaskStore, SQLiteTaskStore
+from common.types import Task, TaskState, TaskStatus
+
+
+def make_task(task_id: str, state: TaskState = TaskState.WORKING) -> Task:
+    return Task(id=task_id, sessionId='session', status=TaskStatus(state=state))
+
+
+async def save_all(store, *tasks: Task):
+    for task in tasks:
+        await store.save(task)
+    await store.close()
+
+
+@pytest.fixture(params=['log', 'sqlite'])
+def open_store(request, tmp_path):
+    if request.param == 'log':
+        return lambda: LogTaskStore(tmp_path / 'tasks')
+    return lambda: SQLiteTaskStore(tmp_path / 'tasks.db')
+
+
+def test_reopen_keeps_latest_version(open_store):
+    asyncio.run(
+        save_all(
+            open_store(),
+            make_task('a'),
+            make_task('b'),
+            make_task('a', TaskState.COMPLETED),
+        )
+    )
+
+    async def reopen():
+        store = open_store()
+        try:
+            return await store.get('a'), await store.get('b')
+        finally:
+            await store.close()
+
+    task_a, task_b = asyncio.run(reopen())
+    assert task_a.status.state == TaskState.COMPLETED
+    assert task_b.status.state == TaskState.WORKING
+
+
+def test_log_store_recovers_from_torn_record(tmp_path):
+    directory = tmp_path / 'tasks'
+    asyncio.run(
+        save_all(LogTaskStore(directory), make_task('a'), make_task('b'))
+    )
+    [segment] = directory.glob('*.log')
+    # A crash in the middle of writing the last record.
+    with segment.open('r+b') as f:
+        f.truncate(segment.stat().st_size - 5)
+
+    async def recover():
+        store = LogTaskStore(directory)
+        assert await store.get('a') is not None
+        assert await store.get('b') is None
+        await store.save(make_task('c'))
+        await store.close()
+
+    asyncio.run(recover())
+
+    async def reopen():
+        store = LogTaskStore(directory)
+        try:
+            return await store.get('a'), await store.get('c')
+        finally:
+            await store.close()
+
+    task_a, task_c = asyncio.run(reopen())
+    assert task_a is not None
+    assert task_c is not None
+
+
+def test_log_store_compact(tmp_path):
+    directory = tmp_path / 'tasks'
+
+    async def write_and_compact():
+        store = LogTaskStore(directory, segment_size=1)
+        for state in (TaskState.SUBMITTED, TaskState.WORKING):
+            await store.save(make_task('a', state))
+            await store.save(make_task('b', state))
+            await store.flush()
+        await store.save(make_task('a', TaskState.COMPLETED))
+        await store.flush()
+        assert len(list(directory.glob('*.log'))) > 1
+        store.compact()
+        await store.close()
+
+    asyncio.run(write_and_compact())
+    assert len(list(directory.glob('*.log'))) == 1
+
+    async def reopen():
+        store = LogTaskStore(directory)
+        try:
+            return await store.get('a'), await store.get('b')
+        finally:
+            await store.close()
+
+    task_a, task_b = asyncio.run(reopen())
+    assert task_a.status.state == TaskState.COMPLETED
+    assert task_b.status.state == TaskState.WORKING